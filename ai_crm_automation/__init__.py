@@ -5,6 +5,15 @@ This module exposes a convenience entrypoint for programmatic usage by
 re-exporting the orchestrator components.
 """
 
-from .agents.orchestrator_agent import OrchestratorAgent, OrchestratorConfig
+from typing import Any
 
 __all__ = ["OrchestratorAgent", "OrchestratorConfig"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolved on first access so importing a submodule does not load the orchestrator
+    if name in __all__:
+        from .agents import orchestrator_agent
+
+        return getattr(orchestrator_agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import base64
-from typing import Any, Dict, Optional
+import time
+from email.message import EmailMessage
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiosmtplib
+import httpx
 from pydantic import BaseModel, EmailStr
 
 from ..utils.api_client import AsyncApiClient
@@ -13,6 +17,14 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Idle SMTP connections are closed after this long; servers drop them eventually anyway
+SMTP_IDLE_TIMEOUT_SECONDS = 300.0
+# Recycle the connection after this many messages (SendGrid caps a connection at 5000)
+SMTP_MAX_MESSAGES_PER_CONNECTION = 5000
+# Provider limits on recipients / messages per batch request
+SENDGRID_MAX_PERSONALIZATIONS = 1000
+RESEND_MAX_BATCH = 100
+
 
 class EmailPayload(BaseModel):
     to: EmailStr
@@ -22,7 +34,12 @@ class EmailPayload(BaseModel):
 
 
 class EmailAgent:
-    def __init__(self, config: Dict[str, Any]):
+    # Bound to the configured provider's implementation in __init__, so sends never re-check the provider
+    send: Callable[[EmailPayload], Awaitable[Dict[str, Any]]]
+    # Sends several emails with as few provider requests as possible
+    send_batch: Callable[[List[EmailPayload]], Awaitable[Dict[str, Any]]]
+
+    def __init__(self, config: Dict[str, Any], http_client: Optional[httpx.AsyncClient] = None):
         self.provider = config.get("provider", "sendgrid").lower()
         self.from_email = config["from_email"]
         self.default_confirmation_recipient = config.get("default_confirmation_recipient")
@@ -30,6 +47,12 @@ class EmailAgent:
         self._resend_key = config.get("resend", {}).get("api_key")
         self._smtp = config.get("smtp", {})
         self._http_client: Optional[AsyncApiClient] = None
+        # One long-lived SMTP session, serialized by the lock since SMTP is a single command stream
+        self._smtp_conn: Optional[aiosmtplib.SMTP] = None
+        self._smtp_lock = asyncio.Lock()
+        self._smtp_sent = 0
+        self._smtp_last_used = 0.0
+        self._smtp_reaper: Optional[asyncio.Task] = None
 
         if self.provider == "sendgrid":
             require(self._sendgrid_key, "SendGrid API key required for sendgrid provider")
@@ -39,7 +62,10 @@ class EmailAgent:
                     "Authorization": f"Bearer {self._sendgrid_key}",
                     "Content-Type": "application/json",
                 },
+                client=http_client,
             )
+            self.send = self._send_sendgrid
+            self.send_batch = self._send_batch_sendgrid
         elif self.provider == "resend":
             require(self._resend_key, "Resend API key required for resend provider")
             self._http_client = AsyncApiClient(
@@ -48,76 +74,144 @@ class EmailAgent:
                     "Authorization": f"Bearer {self._resend_key}",
                     "Content-Type": "application/json",
                 },
+                client=http_client,
             )
+            self.send = self._send_resend
+            self.send_batch = self._send_batch_resend
         elif self.provider == "smtp":
             require(self._smtp.get("host"), "SMTP host required for smtp provider")
+            self.send = self._send_smtp
+            self.send_batch = self._send_batch_smtp
         else:
             raise ValidationError(f"Unsupported email provider {self.provider}")
 
-    async def send(self, payload: EmailPayload) -> Dict[str, Any]:
-        if self.provider == "sendgrid":
-            body = {
-                "personalizations": [
-                    {"to": [{"email": str(payload.to)}]}
-                ],
-                "from": {"email": self.from_email},
-                "subject": payload.subject,
-                "content": [
-                    {"type": "text/plain", "value": payload.text or ""},
-                    {"type": "text/html", "value": payload.html},
-                ],
-            }
-            res = await self._http_client.post("/mail/send", json=body)  # type: ignore[union-attr]
-            # SendGrid returns 202 with no body on success
-            return {"status": "queued", "provider": "sendgrid", "response": res}
-        elif self.provider == "resend":
-            body = {
-                "from": self.from_email,
-                "to": [str(payload.to)],
-                "subject": payload.subject,
-                "html": payload.html,
-            }
-            if payload.text:
-                body["text"] = payload.text
-            res = await self._http_client.post("/emails", json=body)  # type: ignore[union-attr]
-            return {"status": "queued", "provider": "resend", "response": res}
-        else:
-            # SMTP
-            message = (f"From: {self.from_email}\r\n"
-                       f"To: {payload.to}\r\n"
-                       f"Subject: {payload.subject}\r\n"
-                       f"MIME-Version: 1.0\r\n"
-                       f"Content-Type: text/html; charset=utf-8\r\n\r\n"
-                       f"{payload.html}")
-            host = self._smtp.get("host")
-            port = int(self._smtp.get("port", 587))
-            username = self._smtp.get("username")
-            password = self._smtp.get("password")
-            use_tls = bool(self._smtp.get("use_tls", True))
-
-            if use_tls:
-                await aiosmtplib.send(
-                    message,
-                    hostname=host,
-                    port=port,
-                    start_tls=True,
-                    username=username,
-                    password=password,
-                    sender=self.from_email,
-                    recipients=[str(payload.to)],
-                )
-            else:
-                await aiosmtplib.send(
-                    message,
-                    hostname=host,
-                    port=port,
-                    start_tls=False,
-                    username=username,
-                    password=password,
-                    sender=self.from_email,
-                    recipients=[str(payload.to)],
-                )
-            return {"status": "sent", "provider": "smtp"}
+    async def _send_sendgrid(self, payload: EmailPayload) -> Dict[str, Any]:
+        body = {
+            "personalizations": [
+                {"to": [{"email": str(payload.to)}]}
+            ],
+            "from": {"email": self.from_email},
+            "subject": payload.subject,
+            "content": [
+                {"type": "text/plain", "value": payload.text or ""},
+                {"type": "text/html", "value": payload.html},
+            ],
+        }
+        res = await self._http_client.post("/mail/send", json=body)  # type: ignore[union-attr]
+        # SendGrid returns 202 with no body on success
+        return {"status": "queued", "provider": "sendgrid", "response": res}
+
+    async def _send_resend(self, payload: EmailPayload) -> Dict[str, Any]:
+        body = self._resend_body(payload)
+        res = await self._http_client.post("/emails", json=body)  # type: ignore[union-attr]
+        return {"status": "queued", "provider": "resend", "response": res}
+
+    async def _send_smtp(self, payload: EmailPayload) -> Dict[str, Any]:
+        message = EmailMessage()
+        message["From"] = self.from_email
+        message["To"] = str(payload.to)
+        message["Subject"] = payload.subject
+        message.set_content(payload.text or "")
+        message.add_alternative(payload.html, subtype="html")
+        await self._smtp_send_message(message)
+        return {"status": "sent", "provider": "smtp"}
+
+    async def _send_batch_sendgrid(self, payloads: List[EmailPayload]) -> Dict[str, Any]:
+        # Personalizations share one subject and body, so group identical messages together
+        groups: Dict[Tuple[str, str, str], List[EmailPayload]] = {}
+        for payload in payloads:
+            groups.setdefault((payload.subject, payload.html, payload.text or ""), []).append(payload)
+        responses = []
+        for (subject, html, text), group in groups.items():
+            for start in range(0, len(group), SENDGRID_MAX_PERSONALIZATIONS):
+                chunk = group[start:start + SENDGRID_MAX_PERSONALIZATIONS]
+                body = {
+                    "personalizations": [{"to": [{"email": str(p.to)}]} for p in chunk],
+                    "from": {"email": self.from_email},
+                    "subject": subject,
+                    "content": [
+                        {"type": "text/plain", "value": text},
+                        {"type": "text/html", "value": html},
+                    ],
+                }
+                responses.append(await self._http_client.post("/mail/send", json=body))  # type: ignore[union-attr]
+        return {"status": "queued", "provider": "sendgrid", "count": len(payloads), "response": responses}
+
+    async def _send_batch_resend(self, payloads: List[EmailPayload]) -> Dict[str, Any]:
+        responses = []
+        for start in range(0, len(payloads), RESEND_MAX_BATCH):
+            chunk = payloads[start:start + RESEND_MAX_BATCH]
+            body = [self._resend_body(p) for p in chunk]
+            responses.append(await self._http_client.post("/emails/batch", json=body))  # type: ignore[union-attr]
+        return {"status": "queued", "provider": "resend", "count": len(payloads), "response": responses}
+
+    async def _send_batch_smtp(self, payloads: List[EmailPayload]) -> Dict[str, Any]:
+        # SMTP has no batch call; messages reuse the persistent connection one after another
+        await asyncio.gather(*(self._send_smtp(p) for p in payloads))
+        return {"status": "sent", "provider": "smtp", "count": len(payloads)}
+
+    def _resend_body(self, payload: EmailPayload) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "from": self.from_email,
+            "to": [str(payload.to)],
+            "subject": payload.subject,
+            "html": payload.html,
+        }
+        if payload.text:
+            body["text"] = payload.text
+        return body
+
+    async def _smtp_connection(self) -> aiosmtplib.SMTP:
+        # Callers hold self._smtp_lock
+        if self._smtp_conn is not None and self._smtp_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+            await self._smtp_quit()
+        if self._smtp_conn is None or not self._smtp_conn.is_connected:
+            self._smtp_conn = aiosmtplib.SMTP(
+                hostname=self._smtp.get("host"),
+                port=int(self._smtp.get("port", 587)),
+                username=self._smtp.get("username"),
+                password=self._smtp.get("password"),
+                start_tls=bool(self._smtp.get("use_tls", True)),
+            )
+            await self._smtp_conn.connect()
+            self._smtp_sent = 0
+            if self._smtp_reaper is None or self._smtp_reaper.done():
+                self._smtp_reaper = asyncio.create_task(self._reap_idle_smtp())
+        return self._smtp_conn
+
+    async def _smtp_send_message(self, message: EmailMessage) -> None:
+        async with self._smtp_lock:
+            conn = await self._smtp_connection()
+            try:
+                await conn.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server dropped the idle session; reconnect once and resend
+                logger.info("SMTP connection dropped, reconnecting")
+                self._smtp_conn = None
+                conn = await self._smtp_connection()
+                await conn.send_message(message)
+            self._smtp_sent += 1
+            self._smtp_last_used = time.monotonic()
+
+    async def _smtp_quit(self) -> None:
+        conn, self._smtp_conn = self._smtp_conn, None
+        if conn is None or not conn.is_connected:
+            return
+        try:
+            await conn.quit()
+        except aiosmtplib.SMTPException:
+            conn.close()
+
+    async def _reap_idle_smtp(self) -> None:
+        while True:
+            idle_for = time.monotonic() - self._smtp_last_used
+            if idle_for < SMTP_IDLE_TIMEOUT_SECONDS:
+                await asyncio.sleep(SMTP_IDLE_TIMEOUT_SECONDS - idle_for)
+                continue
+            async with self._smtp_lock:
+                if time.monotonic() - self._smtp_last_used >= SMTP_IDLE_TIMEOUT_SECONDS:
+                    await self._smtp_quit()
+                    return
 
     async def send_confirmation(self, to_email: Optional[str], summary_html: str, subject: Optional[str] = None) -> Dict[str, Any]:
         recipient = to_email or self.default_confirmation_recipient
@@ -125,6 +219,16 @@ class EmailAgent:
         subject_final = subject or "CRM Action Confirmation"
         return await self.send(EmailPayload(to=recipient, subject=subject_final, html=summary_html))
 
+    async def warm_up(self) -> None:
+        # SMTP sessions are opened on first send and reaped when idle, so only HTTP providers warm up
+        if self._http_client:
+            await self._http_client.warm_up()
+
     async def aclose(self) -> None:
+        if self._smtp_reaper is not None:
+            self._smtp_reaper.cancel()
+            self._smtp_reaper = None
+        async with self._smtp_lock:
+            await self._smtp_quit()
         if self._http_client:
             await self._http_client.close()
@@ -1,17 +1,40 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
+from contextlib import aclosing
+from typing import Any, Dict, Iterable, List, Optional
 
+import httpx
 from pydantic import BaseModel, EmailStr, Field
 
 from ..utils.api_client import AsyncApiClient
 from ..utils.error_handler import ApiError, ValidationError, require
 from ..utils.logger import get_logger
+from ..utils.rate_limiter import AsyncRateLimiter
+from ..utils.ttl_cache import TTLCache
 
 
 logger = get_logger(__name__)
 
+# HubSpot's documented burst limit for private apps; retuned from response headers at runtime
+DEFAULT_RATE_LIMIT = 100
+DEFAULT_RATE_PERIOD_SECONDS = 10.0
+# Maximum number of inputs HubSpot accepts per batch call
+BATCH_SIZE = 100
+# HUBSPOT_DEFINED association type id for deal -> contact, needed for inline associations on create
+DEAL_TO_CONTACT_ASSOCIATION_TYPE_ID = 3
+# Contact records can be edited outside this process, so full records are only trusted briefly
+CONTACT_CACHE_TTL_SECONDS = 60.0
+CONTACT_CACHE_MAXSIZE = 1024
+# Ids only change when a contact is deleted or merged, which a 404 on that id also evicts
+CONTACT_ID_CACHE_TTL_SECONDS = 300.0
+CONTACT_ID_CACHE_MAXSIZE = 10_000
+
+
+def _chunked(items: List[Any], size: int = BATCH_SIZE) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
 
 class CreateContactInput(BaseModel):
     email: EmailStr
@@ -35,6 +58,14 @@ class CreateDealInput(BaseModel):
     associated_contact_email: Optional[EmailStr] = None
 
 
+class CreateContactsInput(BaseModel):
+    contacts: List[CreateContactInput]
+
+
+class CreateDealsInput(BaseModel):
+    deals: List[CreateDealInput]
+
+
 class UpdateDealInput(BaseModel):
     deal_id: str
     name: Optional[str] = Field(default=None, alias="dealName")
@@ -44,15 +75,55 @@ class UpdateDealInput(BaseModel):
 
 
 class HubSpotAgent:
-    def __init__(self, api_key: Optional[str], base_url: str):
+    def __init__(
+        self,
+        api_key: Optional[str],
+        base_url: str,
+        max_concurrency: int = 10,
+        http_client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+    ):
         token = api_key or os.getenv("HUBSPOT_ACCESS_TOKEN")
         require(bool(token), "HubSpot access token is required. Set HUBSPOT_ACCESS_TOKEN or provide api_key.")
         headers = {
             "Authorization": f"Bearer {token}",
         }
-        self.client = AsyncApiClient(base_url=base_url, default_headers=headers)
+        self.client = AsyncApiClient(
+            base_url=base_url,
+            default_headers=headers,
+            max_concurrency=max_concurrency,
+            # Pass one limiter to every agent that shares a HubSpot app so they draw from one bucket
+            rate_limiter=rate_limiter or AsyncRateLimiter(DEFAULT_RATE_LIMIT, DEFAULT_RATE_PERIOD_SECONDS),
+            client=http_client,
+        )
+        # lowercased email -> contact id, reused across lookups for the same email
+        self._contact_id_cache: TTLCache[str, str] = TTLCache(CONTACT_ID_CACHE_MAXSIZE, CONTACT_ID_CACHE_TTL_SECONDS)
+        # lowercased email -> full contact record
+        self._contact_cache: TTLCache[str, Dict[str, Any]] = TTLCache(CONTACT_CACHE_MAXSIZE, CONTACT_CACHE_TTL_SECONDS)
+
+    def _remember_contact_id(self, email: str, contact_id: Optional[str]) -> None:
+        if email and contact_id:
+            self._contact_id_cache.set(email.lower(), contact_id)
+
+    def _forget_contact(self, email: str) -> None:
+        """Drop cached data for an email whose contact id HubSpot no longer recognizes."""
+        key = email.lower()
+        self._contact_id_cache.pop(key)
+        self._contact_cache.pop(key)
+
+    def _cache_contact(self, email: str, contact: Dict[str, Any]) -> None:
+        if not email or not contact.get("id"):
+            return
+        self._contact_cache.set(email.lower(), contact)
+        self._remember_contact_id(email, contact["id"])
+
+    def _cached_contact(self, email: str) -> Optional[Dict[str, Any]]:
+        return self._contact_cache.get(email.lower())
 
     async def _get_contact_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        cached = self._cached_contact(email)
+        if cached is not None:
+            return cached
         query = {
             "filterGroups": [
                 {
@@ -64,38 +135,78 @@ class HubSpotAgent:
             "properties": ["email", "firstname", "lastname", "phone"],
             "limit": 1,
         }
-        res = await self.client.post("/crm/v3/objects/contacts/search", json=query)
-        if not isinstance(res, dict):
-            return None
-        results = res.get("results", [])
-        if not results:
-            return None
-        return results[0]
+        # Stream the result page so a widened limit still stops reading at the first match
+        stream = self.client.stream_items("POST", "/crm/v3/objects/contacts/search", json=query)
+        async with aclosing(stream) as contacts:
+            async for contact in contacts:
+                if isinstance(contact, dict):
+                    self._cache_contact(email, contact)
+                    return contact
+        return None
 
     async def _find_contact_id_by_email(self, email: str) -> Optional[str]:
+        cached = self._contact_id_cache.get(email.lower())
+        if cached is not None:
+            return cached
         contact = await self._get_contact_by_email(email)
         if not contact:
             return None
         return contact.get("id")
 
-    async def create_contact(self, payload: CreateContactInput) -> Dict[str, Any]:
-        properties: Dict[str, Any] = {"email": str(payload.email)}
-        if payload.first_name:
-            properties["firstname"] = payload.first_name
-        if payload.last_name:
-            properties["lastname"] = payload.last_name
-        if payload.phone:
-            properties["phone"] = payload.phone
+    async def _find_contact_ids_by_email(self, emails: Iterable[str]) -> Dict[str, str]:
+        """Resolve many emails to contact ids, batching cache misses through batch/read."""
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        for email in dict.fromkeys(e.lower() for e in emails):
+            cached = self._contact_id_cache.get(email)
+            if cached is not None:
+                found[email] = cached
+            else:
+                missing.append(email)
+        for chunk in _chunked(missing):
+            body = {
+                "idProperty": "email",
+                "properties": ["email"],
+                "inputs": [{"id": email} for email in chunk],
+            }
+            res = await self.client.post("/crm/v3/objects/contacts/batch/read", json=body)
+            results = res.get("results", []) if isinstance(res, dict) else []
+            for contact in results:
+                email = (contact.get("properties") or {}).get("email")
+                if email and contact.get("id"):
+                    self._remember_contact_id(email, contact["id"])
+                    found[email.lower()] = contact["id"]
+        return found
+
+    @staticmethod
+    def _contact_properties(
+        email: str,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        phone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        fields = (("email", email), ("firstname", first_name), ("lastname", last_name), ("phone", phone))
+        return {key: value for key, value in fields if value}
+
+    async def create_contact(
+        self,
+        email: str,
+        *,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        phone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        properties = self._contact_properties(email, first_name, last_name, phone)
         try:
             res = await self.client.post("/crm/v3/objects/contacts", json={"properties": properties})
         except ApiError as err:
             if err.status == 409:
-                existing = await self._get_contact_by_email(str(payload.email))
+                existing = await self._get_contact_by_email(email)
                 if existing:
                     contact_id = existing.get("id")
                     logger.info(
                         "Contact already existed",
-                        extra={"email": str(payload.email), "contact_id": contact_id},
+                        extra={"email": email, "contact_id": contact_id},
                     )
                     return {
                         "id": contact_id,
@@ -104,73 +215,180 @@ class HubSpotAgent:
                     }
                 logger.warning(
                     "Contact conflict reported but existing record not found",
-                    extra={"email": str(payload.email)},
+                    extra={"email": email},
                 )
             raise
         contact_id = res.get("id") if isinstance(res, dict) else None
+        if isinstance(res, dict):
+            self._cache_contact(email, res)
         logger.info(
             "New contact created",
-            extra={"email": str(payload.email), "contact_id": contact_id},
+            extra={"email": email, "contact_id": contact_id},
         )
         return res
 
-    async def update_contact(self, payload: UpdateContactInput) -> Dict[str, Any]:
-        contact_id = await self._find_contact_id_by_email(str(payload.email))
-        require(contact_id is not None, f"Contact not found for email {payload.email}")
-        properties: Dict[str, Any] = {}
-        if payload.first_name is not None:
-            properties["firstname"] = payload.first_name
-        if payload.last_name is not None:
-            properties["lastname"] = payload.last_name
-        if payload.phone is not None:
-            properties["phone"] = payload.phone
-        res = await self.client.patch(f"/crm/v3/objects/contacts/{contact_id}", json={"properties": properties})
+    async def batch_create_contacts(self, payloads: List[CreateContactInput]) -> Dict[str, Any]:
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunked(payloads):
+            body = {
+                "inputs": [
+                    {"properties": self._contact_properties(str(p.email), p.first_name, p.last_name, p.phone)}
+                    for p in chunk
+                ]
+            }
+            try:
+                res = await self.client.post("/crm/v3/objects/contacts/batch/create", json=body)
+            except ApiError as err:
+                if err.status != 409:
+                    raise
+                # One existing email rejects the whole batch; fall back to the idempotent single create
+                logger.info("Batch contact create conflicted, retrying individually", extra={"count": len(chunk)})
+                for p in chunk:
+                    results.append(
+                        await self.create_contact(str(p.email), first_name=p.first_name, last_name=p.last_name, phone=p.phone)
+                    )
+                continue
+            for contact in res.get("results", []) if isinstance(res, dict) else []:
+                self._cache_contact((contact.get("properties") or {}).get("email", ""), contact)
+                results.append(contact)
+        logger.info("Contacts created in batch", extra={"count": len(results)})
+        return {"results": results}
+
+    async def update_contact(
+        self,
+        email: str,
+        *,
+        first_name: Optional[str] = None,
+        last_name: Optional[str] = None,
+        phone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        contact_id = await self._find_contact_id_by_email(email)
+        require(contact_id is not None, f"Contact not found for email {email}")
+        fields = (("firstname", first_name), ("lastname", last_name), ("phone", phone))
+        properties = {key: value for key, value in fields if value is not None}
+        try:
+            res = await self.client.patch(f"/crm/v3/objects/contacts/{contact_id}", json={"properties": properties})
+        except ApiError as err:
+            if err.status == 404:
+                # Deleted or merged since it was cached; the next call searches again
+                self._forget_contact(email)
+            raise
+        cached = self._cached_contact(email)
+        if cached is not None and isinstance(res, dict):
+            merged_properties = {**cached.get("properties", {}), **res.get("properties", {})}
+            self._cache_contact(email, {**cached, **res, "properties": merged_properties})
         return res
 
-    async def create_deal(self, payload: CreateDealInput) -> Dict[str, Any]:
-        deal_name = payload.name
+    @staticmethod
+    def _deal_properties(
+        name: Optional[str] = None,
+        amount: Optional[float] = None,
+        stage: Optional[str] = None,
+        pipeline: Optional[str] = None,
+        associated_contact_email: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        deal_name = name
         if not deal_name:
-            if payload.associated_contact_email:
-                deal_name = f"Deal for {payload.associated_contact_email}"
-            elif payload.amount is not None:
-                deal_name = f"Deal {payload.amount:g}"
+            if associated_contact_email:
+                deal_name = f"Deal for {associated_contact_email}"
+            elif amount is not None:
+                deal_name = f"Deal {amount:g}"
             else:
                 deal_name = "Untitled Deal"
 
         properties: Dict[str, Any] = {"dealname": deal_name}
-        if payload.amount is not None:
-            properties["amount"] = payload.amount
-        if payload.stage:
-            properties["dealstage"] = payload.stage
-        if payload.pipeline:
-            properties["pipeline"] = payload.pipeline
+        if amount is not None:
+            properties["amount"] = amount
+        if stage:
+            properties["dealstage"] = stage
+        if pipeline:
+            properties["pipeline"] = pipeline
+        return properties
+
+    async def create_deal(
+        self,
+        *,
+        name: Optional[str] = None,
+        amount: Optional[float] = None,
+        stage: Optional[str] = None,
+        pipeline: Optional[str] = None,
+        associated_contact_email: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        properties = self._deal_properties(name, amount, stage, pipeline, associated_contact_email)
 
         create_resp = await self.client.post("/crm/v3/objects/deals", json={"properties": properties})
         deal_id = create_resp.get("id")
 
         # Associate to contact if provided
-        if payload.associated_contact_email:
-            contact_id = await self._find_contact_id_by_email(str(payload.associated_contact_email))
-            require(contact_id is not None, f"Contact not found for email {payload.associated_contact_email}")
+        if associated_contact_email:
+            contact_id = await self._find_contact_id_by_email(associated_contact_email)
+            require(contact_id is not None, f"Contact not found for email {associated_contact_email}")
             # Use v3 associations API with name-based association type to avoid v4's ID requirement
-            await self.client.put(
-                f"/crm/v3/objects/deals/{deal_id}/associations/contacts/{contact_id}/deal_to_contact",
-            )
+            try:
+                await self.client.put(
+                    f"/crm/v3/objects/deals/{deal_id}/associations/contacts/{contact_id}/deal_to_contact",
+                )
+            except ApiError as err:
+                if err.status == 404:
+                    self._forget_contact(associated_contact_email)
+                raise
         return create_resp
 
-    async def update_deal(self, payload: UpdateDealInput) -> Dict[str, Any]:
-        properties: Dict[str, Any] = {}
-        if payload.name is not None:
-            properties["dealname"] = payload.name
-        if payload.amount is not None:
-            properties["amount"] = payload.amount
-        if payload.stage is not None:
-            properties["dealstage"] = payload.stage
-        if payload.pipeline is not None:
-            properties["pipeline"] = payload.pipeline
-
-        res = await self.client.patch(f"/crm/v3/objects/deals/{payload.deal_id}", json={"properties": properties})
+    async def batch_create_deals(self, payloads: List[CreateDealInput]) -> Dict[str, Any]:
+        emails = [str(p.associated_contact_email) for p in payloads if p.associated_contact_email]
+        contact_ids = await self._find_contact_ids_by_email(emails)
+        for email in emails:
+            require(email.lower() in contact_ids, f"Contact not found for email {email}")
+
+        results: List[Dict[str, Any]] = []
+        for chunk in _chunked(payloads):
+            inputs = []
+            for payload in chunk:
+                item: Dict[str, Any] = {
+                    "properties": self._deal_properties(
+                        payload.name,
+                        payload.amount,
+                        payload.stage,
+                        payload.pipeline,
+                        str(payload.associated_contact_email) if payload.associated_contact_email else None,
+                    )
+                }
+                if payload.associated_contact_email:
+                    # Batch results are unordered, so associations are created inline rather than afterwards
+                    item["associations"] = [
+                        {
+                            "to": {"id": contact_ids[str(payload.associated_contact_email).lower()]},
+                            "types": [
+                                {
+                                    "associationCategory": "HUBSPOT_DEFINED",
+                                    "associationTypeId": DEAL_TO_CONTACT_ASSOCIATION_TYPE_ID,
+                                }
+                            ],
+                        }
+                    ]
+                inputs.append(item)
+            res = await self.client.post("/crm/v3/objects/deals/batch/create", json={"inputs": inputs})
+            results.extend(res.get("results", []) if isinstance(res, dict) else [])
+        logger.info("Deals created in batch", extra={"count": len(results)})
+        return {"results": results}
+
+    async def update_deal(
+        self,
+        deal_id: str,
+        *,
+        name: Optional[str] = None,
+        amount: Optional[float] = None,
+        stage: Optional[str] = None,
+        pipeline: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        fields = (("dealname", name), ("amount", amount), ("dealstage", stage), ("pipeline", pipeline))
+        properties = {key: value for key, value in fields if value is not None}
+
+        res = await self.client.patch(f"/crm/v3/objects/deals/{deal_id}", json={"properties": properties})
         return res
 
+    async def warm_up(self) -> None:
+        await self.client.warm_up()
+
     async def aclose(self) -> None:
         await self.client.close()
@@ -1,154 +1,246 @@
 from __future__ import annotations
 
-import json
 from collections import deque
-from typing import Deque, Optional
+from functools import lru_cache, partial
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, EmailStr
-from langchain_openai import ChatOpenAI
-from langchain.tools import tool
-from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
-from .hubspot_agent import HubSpotAgent, CreateContactInput, UpdateContactInput, CreateDealInput, UpdateDealInput
+from .hubspot_agent import (
+    HubSpotAgent,
+    CreateContactInput,
+    CreateContactsInput,
+    UpdateContactInput,
+    CreateDealInput,
+    CreateDealsInput,
+    UpdateDealInput,
+)
 from .email_agent import EmailAgent
 from ..utils.logger import get_logger
 from ..utils.error_handler import ApiError
+from ..utils.serialization import dumps
 
+# LangChain and the OpenAI client take a second or more to import, so they are only
+# loaded once an executor is actually built; HubSpot/email-only callers never pay for it.
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+    from langchain.prompts import ChatPromptTemplate
+    from langchain.tools import StructuredTool
+    from langchain_core.messages import BaseMessage
+    from langchain_openai import ChatOpenAI
 
 logger = get_logger(__name__)
 HISTORY_LIMIT = 8
 
+SYSTEM_PROMPT = (
+    "You are a helpful CRM assistant. Parse the user's request and call the appropriate tools. "
+    "Prefer creating contacts or deals when the user asks; update when they request changes. "
+    "When several contacts or deals are requested at once, use create_contacts or create_deals in one call. "
+    "After successful CRM actions, call send_confirmation_email summarizing what was done. "
+    "Be concise and include key identifiers like emails or IDs in the summary."
+)
+
+
+@lru_cache(maxsize=1)
+def _prompt() -> ChatPromptTemplate:
+    from langchain.prompts import ChatPromptTemplate
+
+    return ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("placeholder", "{chat_history}"),
+        ("human", "{input}"),
+        ("placeholder", "{agent_scratchpad}"),
+    ])
+
 
 class OrchestratorConfig(BaseModel):
     openai_api_key: str
     openai_model: str
 
 
+class SendConfirmationEmailInput(BaseModel):
+    to: Optional[str] = None
+    subject: Optional[str] = None
+    html: str
+
+
+def _summarize(action: str, res: Any) -> Dict[str, Any]:
+    """Reduce an API response to what the LLM needs for its next step; the full payload is logged."""
+    logger.debug("Tool result", extra={"action": action, "result": res})
+    summary: Dict[str, Any] = {"action": action, "status": "ok"}
+    if isinstance(res, dict):
+        if res.get("id"):
+            summary["id"] = res["id"]
+        if isinstance(res.get("status"), str):
+            summary["status"] = res["status"]
+        if isinstance(res.get("results"), list):
+            summary["ids"] = [item.get("id") for item in res["results"] if isinstance(item, dict)]
+    return summary
+
+
+# Tool bodies are module-level and receive the agent they act on as their first argument,
+# which is bound per orchestrator with functools.partial. LangChain has already validated the
+# arguments against each tool's args_schema, so they are passed straight to the agent methods
+# instead of being rebuilt into (and re-validated by) another model instance.
+async def create_contact_tool(
+    hubspot: HubSpotAgent,
+    email: EmailStr,
+    firstName: Optional[str] = None,
+    lastName: Optional[str] = None,
+    phone: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Create a new HubSpot contact with the supplied fields."""
+    res = await hubspot.create_contact(str(email), first_name=firstName, last_name=lastName, phone=phone)
+    return _summarize("create_contact", res)
+
+
+async def create_contacts_tool(hubspot: HubSpotAgent, contacts: List[CreateContactInput]) -> Dict[str, Any]:
+    """Create several HubSpot contacts in a single batch request."""
+    res = await hubspot.batch_create_contacts(contacts)
+    return _summarize("create_contacts", res)
+
+
+async def update_contact_tool(
+    hubspot: HubSpotAgent,
+    email: EmailStr,
+    firstName: Optional[str] = None,
+    lastName: Optional[str] = None,
+    phone: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Update an existing HubSpot contact identified by email."""
+    res = await hubspot.update_contact(str(email), first_name=firstName, last_name=lastName, phone=phone)
+    return _summarize("update_contact", res)
+
+
+async def create_deal_tool(
+    hubspot: HubSpotAgent,
+    dealName: Optional[str] = None,
+    amount: Optional[float] = None,
+    stage: Optional[str] = None,
+    pipeline: Optional[str] = None,
+    associated_contact_email: Optional[EmailStr] = None,
+) -> Dict[str, Any]:
+    """Create a HubSpot deal and optionally associate it with a contact."""
+    res = await hubspot.create_deal(
+        name=dealName,
+        amount=amount,
+        stage=stage,
+        pipeline=pipeline,
+        associated_contact_email=str(associated_contact_email) if associated_contact_email else None,
+    )
+    return _summarize("create_deal", res)
+
+
+async def create_deals_tool(hubspot: HubSpotAgent, deals: List[CreateDealInput]) -> Dict[str, Any]:
+    """Create several HubSpot deals in a single batch request, each optionally tied to a contact."""
+    res = await hubspot.batch_create_deals(deals)
+    return _summarize("create_deals", res)
+
+
+async def update_deal_tool(
+    hubspot: HubSpotAgent,
+    deal_id: str,
+    dealName: Optional[str] = None,
+    amount: Optional[float] = None,
+    stage: Optional[str] = None,
+    pipeline: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Update fields on an existing HubSpot deal."""
+    res = await hubspot.update_deal(deal_id, name=dealName, amount=amount, stage=stage, pipeline=pipeline)
+    return _summarize("update_deal", res)
+
+
+async def send_confirmation_email_tool(
+    email: EmailAgent,
+    html: str,
+    to: Optional[str] = None,
+    subject: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Send a confirmation email summarizing recent CRM actions."""
+    res = await email.send_confirmation(to_email=to, subject=subject, summary_html=html)
+    return _summarize("send_email", res)
+
+
+# (tool name, coroutine, agent it is bound to, args schema)
+TOOL_SPECS: Tuple[Tuple[str, Any, str, type], ...] = (
+    ("create_contact", create_contact_tool, "hubspot", CreateContactInput),
+    ("create_contacts", create_contacts_tool, "hubspot", CreateContactsInput),
+    ("update_contact", update_contact_tool, "hubspot", UpdateContactInput),
+    ("create_deal", create_deal_tool, "hubspot", CreateDealInput),
+    ("create_deals", create_deals_tool, "hubspot", CreateDealsInput),
+    ("update_deal", update_deal_tool, "hubspot", UpdateDealInput),
+    ("send_confirmation_email", send_confirmation_email_tool, "email", SendConfirmationEmailInput),
+)
+
+
+def _build_tools(hubspot: Optional[HubSpotAgent], email: Optional[EmailAgent]) -> List[StructuredTool]:
+    from langchain.tools import StructuredTool
+
+    targets = {"hubspot": hubspot, "email": email}
+    return [
+        StructuredTool.from_function(
+            coroutine=partial(coroutine, targets[target]),
+            name=name,
+            description=coroutine.__doc__,
+            args_schema=schema,
+        )
+        for name, coroutine, target, schema in TOOL_SPECS
+    ]
+
+
+@lru_cache(maxsize=1)
+def _tool_schemas() -> Tuple[Dict[str, Any], ...]:
+    """OpenAI function schemas for every tool, converted once per process."""
+    from langchain_core.utils.function_calling import convert_to_openai_tool
+
+    # Converting only reads tool names, descriptions and args schemas, so unbound tools are enough
+    return tuple(convert_to_openai_tool(tool) for tool in _build_tools(None, None))
+
+
 class OrchestratorAgent:
     def __init__(self, config: OrchestratorConfig, hubspot: HubSpotAgent, email: EmailAgent):
+        self.config = config
         self.hubspot = hubspot
         self.email = email
-        self.llm = ChatOpenAI(model=config.openai_model, api_key=config.openai_api_key, temperature=0)
-        self.agent_executor = self._build_agent()
+        self.llm: Optional[ChatOpenAI] = None
+        self.agent_executor: Optional[AgentExecutor] = None
         self.history: Deque[BaseMessage] = deque(maxlen=HISTORY_LIMIT)
+        # False when the last run() answered with an error message instead of a result
+        self.last_run_ok = False
+        # Tools invoked by the last successful run(); every tool writes to the CRM or sends mail
+        self.last_run_tool_calls = 0
 
     def _build_agent(self) -> AgentExecutor:
-        # Define tools that wrap our async methods. LangChain tools can be async.
-        @tool("create_contact", args_schema=CreateContactInput, return_direct=False)
-        async def create_contact_tool(
-            email: EmailStr,
-            firstName: Optional[str] = None,
-            lastName: Optional[str] = None,
-            phone: Optional[str] = None,
-        ) -> str:
-            """Create a new HubSpot contact with the supplied fields."""
-            payload = CreateContactInput(
-                email=email,
-                first_name=firstName,
-                last_name=lastName,
-                phone=phone,
-            )
-            res = await self.hubspot.create_contact(payload)
-            return json.dumps({"action": "create_contact", "result": res})
-
-        @tool("update_contact", args_schema=UpdateContactInput, return_direct=False)
-        async def update_contact_tool(
-            email: EmailStr,
-            firstName: Optional[str] = None,
-            lastName: Optional[str] = None,
-            phone: Optional[str] = None,
-        ) -> str:
-            """Update an existing HubSpot contact identified by email."""
-            payload = UpdateContactInput(
-                email=email,
-                first_name=firstName,
-                last_name=lastName,
-                phone=phone,
-            )
-            res = await self.hubspot.update_contact(payload)
-            return json.dumps({"action": "update_contact", "result": res})
-
-        @tool("create_deal", args_schema=CreateDealInput, return_direct=False)
-        async def create_deal_tool(
-            dealName: Optional[str] = None,
-            amount: Optional[float] = None,
-            stage: Optional[str] = None,
-            pipeline: Optional[str] = None,
-            associated_contact_email: Optional[EmailStr] = None,
-        ) -> str:
-            """Create a HubSpot deal and optionally associate it with a contact."""
-            payload = CreateDealInput(
-                name=dealName,
-                amount=amount,
-                stage=stage,
-                pipeline=pipeline,
-                associated_contact_email=associated_contact_email,
-            )
-            res = await self.hubspot.create_deal(payload)
-            return json.dumps({"action": "create_deal", "result": res})
-
-        @tool("update_deal", args_schema=UpdateDealInput, return_direct=False)
-        async def update_deal_tool(
-            deal_id: str,
-            dealName: Optional[str] = None,
-            amount: Optional[float] = None,
-            stage: Optional[str] = None,
-            pipeline: Optional[str] = None,
-        ) -> str:
-            """Update fields on an existing HubSpot deal."""
-            payload = UpdateDealInput(
-                deal_id=deal_id,
-                name=dealName,
-                amount=amount,
-                stage=stage,
-                pipeline=pipeline,
-            )
-            res = await self.hubspot.update_deal(payload)
-            return json.dumps({"action": "update_deal", "result": res})
-
-        @tool("send_confirmation_email")
-        async def send_confirmation_email_tool(to: Optional[str], subject: Optional[str], html: str) -> str:
-            """Send a confirmation email summarizing recent CRM actions."""
-            res = await self.email.send_confirmation(to_email=to, subject=subject, summary_html=html)
-            return json.dumps({"action": "send_email", "result": res})
-
-        tools = [
-            create_contact_tool,
-            update_contact_tool,
-            create_deal_tool,
-            update_deal_tool,
-            send_confirmation_email_tool,
-        ]
-
-        system = (
-            "You are a helpful CRM assistant. Parse the user's request and call the appropriate tools. "
-            "Prefer creating contacts or deals when the user asks; update when they request changes. "
-            "After successful CRM actions, call send_confirmation_email summarizing what was done. "
-            "Be concise and include key identifiers like emails or IDs in the summary."
-        )
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system),
-            ("placeholder", "{chat_history}"),
-            ("human", "{input}"),
-            ("placeholder", "{agent_scratchpad}"),
-        ])
-        agent = create_tool_calling_agent(self.llm, tools, prompt)
-        return AgentExecutor(agent=agent, tools=tools, verbose=False)
+        """Create the executor on first use so constructing the orchestrator stays cheap."""
+        from langchain.agents import AgentExecutor, create_tool_calling_agent
+        from langchain_openai import ChatOpenAI
+
+        # The model owns an HTTP pool tied to the current event loop, so it is built per orchestrator;
+        # only the loop-independent prompt and tool schemas are shared
+        self.llm = ChatOpenAI(model=self.config.openai_model, api_key=self.config.openai_api_key, temperature=0)
+        agent = create_tool_calling_agent(self.llm, list(_tool_schemas()), _prompt())
+        tools = _build_tools(self.hubspot, self.email)
+        self.agent_executor = AgentExecutor(agent=agent, tools=tools, verbose=False, return_intermediate_steps=True)
+        return self.agent_executor
 
     async def run(self, user_input: str) -> str:
+        from langchain_core.messages import AIMessage, HumanMessage
+
         history_messages = list(self.history)
+        self.last_run_tool_calls = 0
         try:
-            result = await self.agent_executor.ainvoke({"input": user_input, "chat_history": history_messages})
+            executor = self.agent_executor or self._build_agent()
+            result = await executor.ainvoke({"input": user_input, "chat_history": history_messages})
             output = result.get("output", "Done")
+            self.last_run_tool_calls = len(result.get("intermediate_steps") or ())
             self.history.append(HumanMessage(content=user_input))
             self.history.append(AIMessage(content=output))
+            self.last_run_ok = True
             return output
         except ApiError as e:
             detail = e.details
             if isinstance(detail, (dict, list)):
-                detail_str = json.dumps(detail)
+                detail_str = dumps(detail)
             elif detail is not None:
                 detail_str = str(detail)
             else:
@@ -160,10 +252,12 @@ class OrchestratorAgent:
             error_message = f"API error {e.status}: {detail_str}. Please verify your credentials and permissions."
             self.history.append(HumanMessage(content=user_input))
             self.history.append(AIMessage(content=error_message))
+            self.last_run_ok = False
             return error_message
         except Exception as e:
             logger.exception("Orchestrator run failed")
             error_message = f"Sorry, something went wrong: {str(e)}"
             self.history.append(HumanMessage(content=user_input))
             self.history.append(AIMessage(content=error_message))
+            self.last_run_ok = False
             return error_message
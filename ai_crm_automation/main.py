@@ -1,20 +1,44 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import json
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
 
 from .agents.hubspot_agent import HubSpotAgent
 from .agents.email_agent import EmailAgent
 from .agents.orchestrator_agent import OrchestratorAgent, OrchestratorConfig
+from .utils.api_client import create_http_client
 from .utils.logger import get_logger
+from .utils.rate_limiter import AsyncRateLimiter
+from .utils.ttl_cache import TTLCache
 
 
 logger = get_logger(__name__)
 
+QUERY_CACHE_TTL_SECONDS = 30.0
+QUERY_CACHE_MAXSIZE = 1024
+
+# normalized query -> reply
+_query_cache: TTLCache[str, str] = TTLCache(QUERY_CACHE_MAXSIZE, QUERY_CACHE_TTL_SECONDS)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.lower() in {"1", "true", "yes"}
+
 
 def _config_from_env() -> Optional[Dict[str, Any]]:
     openai_key = os.getenv("OPENAI_API_KEY")
@@ -33,6 +57,7 @@ def _config_from_env() -> Optional[Dict[str, Any]]:
         "hubspot": {
             "api_key": hubspot_key,
             "base_url": os.getenv("HUBSPOT_BASE_URL", "https://api.hubapi.com"),
+            "max_concurrency": _env_int("HUBSPOT_MAX_CONCURRENCY", 10),
         },
         "email": {
             "provider": email_provider,
@@ -42,10 +67,10 @@ def _config_from_env() -> Optional[Dict[str, Any]]:
             "resend": {},
             "smtp": {
                 "host": os.getenv("SMTP_HOST"),
-                "port": int(os.getenv("SMTP_PORT", "587")),
+                "port": _env_int("SMTP_PORT", 587),
                 "username": os.getenv("SMTP_USERNAME"),
                 "password": os.getenv("SMTP_PASSWORD"),
-                "use_tls": os.getenv("SMTP_USE_TLS", "true").lower() in {"1", "true", "yes"},
+                "use_tls": _env_bool("SMTP_USE_TLS", True),
             },
         },
     }
@@ -70,10 +95,15 @@ def _config_from_env() -> Optional[Dict[str, Any]]:
     return config
 
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Dict[str, Any]:
     """
     Load configuration from config.json. If the file is missing, raise a
     descriptive error so users can copy config.example.json.
+
+    The result is cached for the life of the process and shared between
+    callers, so treat it as read-only; call ``load_config.cache_clear()``
+    to pick up changes to the file or environment.
     """
     config_path_env = os.getenv("AI_CRM_CONFIG")
     if config_path_env:
@@ -95,45 +125,120 @@ def load_config() -> Dict[str, Any]:
         return json.load(f)
 
 
-def init_agents(config: Dict[str, Any]) -> tuple[HubSpotAgent, EmailAgent, OrchestratorAgent]:
-    openai_key = config["openai"]["api_key"]
-    openai_model = config["openai"].get("model", "gpt-4o-mini")
-
+def init_agents(
+    config: Dict[str, Any],
+    http_client: Optional[httpx.AsyncClient] = None,
+    rate_limiter: Optional[AsyncRateLimiter] = None,
+) -> tuple[HubSpotAgent, EmailAgent, OrchestratorAgent]:
     hs_cfg = config.get("hubspot", {})
     hs_key = hs_cfg.get("api_key") or os.getenv("HUBSPOT_ACCESS_TOKEN")
     hs_base = config["hubspot"].get("base_url", "https://api.hubapi.com")
+    hs_concurrency = int(hs_cfg.get("max_concurrency", 10))
 
     email_cfg = config["email"]
 
-    hubspot_agent = HubSpotAgent(api_key=hs_key, base_url=hs_base)
-    email_agent = EmailAgent(config=email_cfg)
+    hubspot_agent = HubSpotAgent(
+        api_key=hs_key,
+        base_url=hs_base,
+        max_concurrency=hs_concurrency,
+        http_client=http_client,
+        rate_limiter=rate_limiter,
+    )
+    email_agent = EmailAgent(config=email_cfg, http_client=http_client)
 
-    orchestrator = OrchestratorAgent(
+    orchestrator = init_orchestrator(config, hubspot_agent, email_agent)
+    return hubspot_agent, email_agent, orchestrator
+
+
+def init_orchestrator(config: Dict[str, Any], hubspot_agent: HubSpotAgent, email_agent: EmailAgent) -> OrchestratorAgent:
+    """Build an orchestrator over existing agents; cheap, so servers can create one per request."""
+    openai_key = config["openai"]["api_key"]
+    openai_model = config["openai"].get("model", "gpt-4o-mini")
+    return OrchestratorAgent(
         config=OrchestratorConfig(openai_api_key=openai_key, openai_model=openai_model),
         hubspot=hubspot_agent,
         email=email_agent,
     )
-    return hubspot_agent, email_agent, orchestrator
 
 
-async def async_main(user_query: Optional[str]) -> int:
+async def warm_up_agents(hubspot_agent: HubSpotAgent, email_agent: EmailAgent) -> None:
+    """Open connections to the HubSpot and email APIs concurrently before they are needed."""
+    await asyncio.gather(hubspot_agent.warm_up(), email_agent.warm_up())
+
+
+async def _run_orchestrator(
+    query: str,
+    agents: Optional[Tuple[HubSpotAgent, EmailAgent]],
+) -> Tuple[str, bool]:
     config = load_config()
-    hubspot_agent, email_agent, orchestrator = init_agents(config)
+    if agents is not None:
+        # Long-lived agents keep their connections, rate limiter, caches and SMTP session;
+        # only the orchestrator (and its conversation history) is per request
+        orchestrator = init_orchestrator(config, *agents)
+        output = await orchestrator.run(query)
+        return output, orchestrator.last_run_ok and orchestrator.last_run_tool_calls == 0
 
-    query = user_query
-    if not query:
-        query = input("Enter your CRM request: ")
+    http_client = create_http_client()
+    hubspot_agent, email_agent, orchestrator = init_agents(config, http_client=http_client)
 
+    # Handshakes overlap with the first LLM round trip instead of delaying it
+    warm_up = asyncio.create_task(warm_up_agents(hubspot_agent, email_agent))
     try:
         output = await orchestrator.run(query)
-        print(output)
-        return 0
+        # Every tool has side effects, so only a successful run that called none can be replayed
+        return output, orchestrator.last_run_ok and orchestrator.last_run_tool_calls == 0
     finally:
+        warm_up.cancel()
         await asyncio.gather(
             hubspot_agent.aclose(),
             email_agent.aclose(),
             return_exceptions=True,
         )
+        await http_client.aclose()
+
+
+async def run_query(query: str, agents: Optional[Tuple[HubSpotAgent, EmailAgent]] = None) -> str:
+    """
+    Run one request through the orchestrator and return its reply.
+
+    Long-running servers pass their shared ``(hubspot, email)`` agents so connections, rate
+    limits and caches carry across requests; without them a full set of agents is created,
+    warmed up and closed for this call.
+    """
+    output, _ = await _run_orchestrator(query, agents)
+    return output
+
+
+def _query_cache_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+async def cached_run_query(query: str, agents: Optional[Tuple[HubSpotAgent, EmailAgent]] = None) -> str:
+    """
+    Like run_query, but repeats of a query within QUERY_CACHE_TTL_SECONDS reuse the reply.
+
+    Only replies from successful runs that called no tool are cached: every tool creates or
+    updates CRM records or sends mail, so replaying one of those replies would claim work
+    that never ran.
+    """
+    key = _query_cache_key(query)
+    cached = _query_cache.get(key)
+    if cached is not None:
+        return cached
+
+    output, cacheable = await _run_orchestrator(query, agents)
+    if cacheable:
+        _query_cache.set(key, output)
+    return output
+
+
+async def async_main(user_query: Optional[str]) -> int:
+    query = user_query
+    if not query:
+        query = input("Enter your CRM request: ")
+
+    print(await run_query(query))
+    return 0
 
 
 def main() -> None:
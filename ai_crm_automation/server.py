@@ -7,7 +7,8 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from .main import init_agents, load_config
+from .main import init_agents, load_config, warm_up_agents
+from .utils.api_client import create_http_client
 
 
 class RunRequest(BaseModel):
@@ -32,11 +33,14 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event() -> None:
     config = load_config()
-    hubspot_agent, email_agent, orchestrator = init_agents(config)
+    http_client = create_http_client()
+    hubspot_agent, email_agent, orchestrator = init_agents(config, http_client=http_client)
     app.state.config = config
+    app.state.http_client = http_client
     app.state.hubspot = hubspot_agent
     app.state.email = email_agent
     app.state.orchestrator = orchestrator
+    await warm_up_agents(hubspot_agent, email_agent)
 
 
 @app.on_event("shutdown")
@@ -50,6 +54,9 @@ async def shutdown_event() -> None:
         closers.append(email_agent.aclose())
     if closers:
         await asyncio.gather(*closers, return_exceptions=True)
+    http_client = getattr(app.state, "http_client", None)
+    if http_client:
+        await http_client.aclose()
 
 
 @app.get("/health", tags=["system"])
@@ -2,8 +2,11 @@
 Utility helpers shared across the AI CRM Automation package.
 """
 
-from .api_client import AsyncApiClient
+from .api_client import AsyncApiClient, create_http_client
+from .dns_cache import DNSCache
 from .error_handler import ApiError, ValidationError
 from .logger import get_logger
+from .rate_limiter import AsyncRateLimiter
+from .ttl_cache import TTLCache
 
-__all__ = ["AsyncApiClient", "ApiError", "ValidationError", "get_logger"]
+__all__ = ["AsyncApiClient", "AsyncRateLimiter", "ApiError", "DNSCache", "TTLCache", "ValidationError", "create_http_client", "get_logger"]
@@ -1,24 +1,156 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, Optional
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 import httpx
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is an optional speedup
+    ijson = None  # type: ignore[assignment]
+
+from . import serialization
+from .dns_cache import CachingNetworkBackend, DNSCache
 from .error_handler import ApiError
 from .logger import get_logger
+from .rate_limiter import AsyncRateLimiter
 
 
 logger = get_logger(__name__)
 
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 4.0
+RETRY_AFTER_MAX_SECONDS = 60.0
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 50
+LOG_BODY_MAX_CHARS = 2048
+
+
+def create_http_client(timeout: int = 30, dns_cache: Optional[DNSCache] = None) -> httpx.AsyncClient:
+    """Build a pooled HTTP/2 client that several AsyncApiClient instances can share.
+
+    Hostnames are resolved once and pinned for the cache TTL, so new pool
+    connections skip the DNS round-trip.
+    """
+    # Let httpx build its own transports so HTTP(S)_PROXY / NO_PROXY mounts still apply
+    client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+        timeout=httpx.Timeout(timeout),
+    )
+    # httpx has no resolver option, so this reaches into private attributes
+    # (AsyncClient._transport -> AsyncHTTPTransport._pool -> AsyncConnectionPool._network_backend)
+    # to wrap the direct-connection backend. Proxied requests go through their own mounts and
+    # resolve the proxy normally. tests/test_dns_cache.py fails if httpx moves these internals.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    if pool is not None and hasattr(pool, "_network_backend"):
+        pool._network_backend = CachingNetworkBackend(pool._network_backend, dns_cache or DNSCache())
+    else:
+        logger.warning("httpx connection pool internals not found; DNS pinning is disabled")
+    return client
+
+
+def _backoff_delay(attempt: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+
+def _retry_after_delay(response: httpx.Response, attempt: int) -> float:
+    """Seconds to wait after a 429, preferring the server's own hints."""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                reset_at = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                reset_at = None
+            delay = (reset_at - datetime.now(timezone.utc)).total_seconds() if reset_at else -1.0
+        if delay >= 0:
+            return min(delay, RETRY_AFTER_MAX_SECONDS)
+    interval_ms = response.headers.get("X-HubSpot-RateLimit-Interval-Milliseconds")
+    if interval_ms:
+        try:
+            return min(float(interval_ms) / 1000, RETRY_AFTER_MAX_SECONDS)
+        except ValueError:
+            pass
+    return _backoff_delay(attempt)
+
+
+def _log_body(body: Any) -> str:
+    """Render an error body for logging, capped so large HubSpot validation payloads stay cheap."""
+    text = body if isinstance(body, str) else serialization.dumps(body)
+    if len(text) > LOG_BODY_MAX_CHARS:
+        return f"{text[:LOG_BODY_MAX_CHARS]}... [{len(text)} chars]"
+    return text
+
+
+def _select_items(body: Any, item_path: str) -> Iterator[Any]:
+    """Walk an ijson-style prefix such as ``results.item`` over an already parsed body."""
+    node = body
+    parts = item_path.split(".") if item_path else []
+    for index, key in enumerate(parts):
+        if key == "item":
+            if not isinstance(node, list):
+                return
+            rest = ".".join(parts[index + 1:])
+            for element in node:
+                yield from _select_items(element, rest)
+            return
+        if not isinstance(node, dict) or key not in node:
+            return
+        node = node[key]
+    yield node
+
+
+def _tune_limiter(limiter: AsyncRateLimiter, headers: httpx.Headers) -> None:
+    """Adopt the quota HubSpot reports on every response."""
+    max_rate = headers.get("X-HubSpot-RateLimit-Max")
+    interval_ms = headers.get("X-HubSpot-RateLimit-Interval-Milliseconds")
+    if not max_rate or not interval_ms:
+        return
+    remaining = headers.get("X-HubSpot-RateLimit-Remaining")
+    try:
+        limiter.update(
+            max_rate=float(max_rate),
+            time_period=float(interval_ms) / 1000,
+            remaining=float(remaining) if remaining is not None else None,
+        )
+    except ValueError:
+        logger.debug("Ignoring malformed rate limit headers", extra={"max": max_rate, "interval_ms": interval_ms})
+
 
 class AsyncApiClient:
-    def __init__(self, base_url: str, default_headers: Optional[Dict[str, str]] = None, timeout: int = 30):
+    def __init__(
+        self,
+        base_url: str,
+        default_headers: Optional[Dict[str, str]] = None,
+        timeout: int = 30,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        rate_limiter: Optional[AsyncRateLimiter] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
         self.base_url = base_url.rstrip("/")
         self.default_headers = default_headers or {}
+        # Normalized once here; most calls pass no per-call headers and reuse these as-is
+        self._default_headers = httpx.Headers(self.default_headers)
+        self._json_headers = httpx.Headers({"Content-Type": "application/json", **self.default_headers})
+        self._timeout_seconds = timeout
         self.timeout = httpx.Timeout(timeout)
-        self._client: Optional[httpx.AsyncClient] = None
+        # A client passed in is shared with other agents and is closed by whoever created it
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
+        # Caps in-flight requests so tool fan-out cannot burst past upstream rate limits
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        # Optional and shareable, so several clients for one tenant can draw from a single quota
+        self._limiter = rate_limiter
 
     async def __aenter__(self):
         await self.ensure_session()
@@ -29,25 +161,104 @@ class AsyncApiClient:
 
     async def ensure_session(self) -> httpx.AsyncClient:
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout)
+            self._client = create_http_client(self._timeout_seconds)
+            self._owns_client = True
         return self._client
 
+    async def warm_up(self) -> None:
+        """Open a pooled connection ahead of the first real request so it skips the TLS handshake."""
+        client = await self.ensure_session()
+        try:
+            await client.head(self.base_url, timeout=self.timeout)
+        except httpx.HTTPError as exc:
+            logger.debug("Connection warm-up failed", extra={"error": str(exc), "url": self.base_url})
+
     async def close(self) -> None:
-        if self._client and not self._client.is_closed:
+        if self._owns_client and self._client and not self._client.is_closed:
             await self._client.aclose()
 
-    def _merge_headers(self, headers: Optional[Dict[str, str]]) -> Dict[str, str]:
-        merged = dict(self.default_headers)
-        if headers:
-            merged.update(headers)
+    def _merge_headers(self, headers: Optional[Dict[str, str]], has_body: bool = False) -> httpx.Headers:
+        base = self._json_headers if has_body else self._default_headers
+        if not headers:
+            return base
+        merged = base.copy()
+        merged.update(headers)
         return merged
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=0.5, min=0.5, max=4),
-        retry=retry_if_exception_type((httpx.HTTPError, asyncio.TimeoutError)),
-    )
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        *,
+        headers: Optional[Dict[str, str]],
+        params: Optional[Dict[str, Any]],
+        json: Optional[Any],
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Issue a request, retrying transport errors and 429s; other statuses are returned as-is."""
+        client = await self.ensure_session()
+        url = path if path.startswith("/") else f"/{path}"
+        content: Optional[bytes] = None
+        if json is not None:
+            content = serialization.dumps_bytes(json)
+        request = client.build_request(
+            method=method.upper(),
+            url=f"{self.base_url}{url}",
+            headers=self._merge_headers(headers, has_body=json is not None),
+            params=params,
+            content=content,
+            timeout=self.timeout,
+        )
+        attempt = 0
+        while True:
+            attempt += 1
+            retries_left = attempt <= self.max_retries
+            if self._limiter is not None:
+                await self._limiter.acquire()
+            try:
+                async with self._sem:
+                    response = await client.send(request, stream=stream)
+            except (httpx.TransportError, asyncio.TimeoutError) as exc:
+                if not retries_left:
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.warning(
+                    "Transient HTTP exception, retrying",
+                    extra={"error": str(exc), "url": str(request.url), "attempt": attempt, "delay": delay},
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            if self._limiter is not None:
+                _tune_limiter(self._limiter, response.headers)
+
+            if response.status_code == 429 and retries_left:
+                if stream:
+                    await response.aclose()
+                delay = _retry_after_delay(response, attempt)
+                logger.warning(
+                    "Rate limited, retrying",
+                    extra={"url": str(request.url), "attempt": attempt, "delay": delay},
+                )
+                await asyncio.sleep(delay)
+                continue
+            return response
+
+    @staticmethod
+    def _decode_body(response: httpx.Response) -> Any:
+        try:
+            return serialization.loads(response.content)
+        except (serialization.JSONDecodeError, UnicodeDecodeError):
+            return response.text
+
+    @staticmethod
+    def _raise_api_error(response: httpx.Response, body: Any) -> None:
+        logger.error(
+            "HTTP error",
+            extra={"status": response.status_code, "url": str(response.request.url), "body": _log_body(body)},
+        )
+        raise ApiError(response.status_code, "HTTP request failed", details=body)
+
     async def request(
         self,
         method: str,
@@ -57,40 +268,50 @@ class AsyncApiClient:
         params: Optional[Dict[str, Any]] = None,
         json: Optional[Any] = None,
     ) -> Any:
-        client = await self.ensure_session()
-        merged_headers = self._merge_headers(headers)
-        url = path if path.startswith("/") else f"/{path}"
+        response = await self._send(method, path, headers=headers, params=params, json=json)
+        body = self._decode_body(response)
+        if 200 <= response.status_code < 300:
+            return body
+        self._raise_api_error(response, body)
+
+    async def stream_items(
+        self,
+        method: str,
+        path: str,
+        *,
+        item_path: str = "results.item",
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yield the JSON items found at ``item_path`` (ijson prefix syntax) as the body arrives.
+
+        With ijson installed the body is parsed incrementally, so a caller that stops early never
+        holds the whole response in memory. Without it the body is read and parsed in one go.
+        """
+        response = await self._send(method, path, headers=headers, params=params, json=json, stream=True)
         try:
-            response = await client.request(
-                method=method.upper(),
-                url=url,
-                headers=merged_headers,
-                params=params,
-                json=json,
-            )
-            content_type = response.headers.get("Content-Type", "")
-            if "application/json" in content_type:
-                try:
-                    body: Any = response.json()
-                except ValueError:
-                    body = response.text
-            else:
-                body = response.text
-
-            if 200 <= response.status_code < 300:
-                return body
-
-            logger.error(
-                "HTTP error",
-                extra={"status": response.status_code, "url": response.request.url, "body": body},
-            )
-            raise ApiError(response.status_code, "HTTP request failed", details=body)
-        except (httpx.HTTPError, asyncio.TimeoutError) as exc:
-            logger.warning(
-                "Transient HTTP exception, will retry if attempts remain",
-                extra={"error": str(exc), "url": f"{self.base_url}{url}"},
-            )
-            raise
+            if not 200 <= response.status_code < 300:
+                await response.aread()
+                self._raise_api_error(response, self._decode_body(response))
+            if ijson is None:
+                await response.aread()
+                for item in _select_items(serialization.loads(response.content), item_path):
+                    yield item
+                return
+            events = ijson.sendable_list()
+            parser = ijson.items_coro(events, item_path, use_float=True)
+            async for chunk in response.aiter_bytes():
+                parser.send(chunk)
+                for item in events:
+                    yield item
+                del events[:]
+            parser.close()
+            for item in events:
+                yield item
+        finally:
+            await response.aclose()
 
     async def get(self, path: str, **kwargs) -> Any:
         return await self.request("GET", path, **kwargs)
@@ -4,6 +4,9 @@ from typing import Any, Optional
 
 
 class ApiError(Exception):
+    # Slots keep the attributes off BaseException's lazily created instance __dict__
+    __slots__ = ("status", "message", "details")
+
     def __init__(self, status: int, message: str, details: Optional[Any] = None):
         super().__init__(f"API error {status}: {message}")
         self.status = status
@@ -12,9 +15,10 @@ class ApiError(Exception):
 
 
 class ValidationError(Exception):
-    pass
+    __slots__ = ()
 
 
 def require(condition: bool, message: str) -> None:
-    if not condition:
-        raise ValidationError(message)
+    if condition:
+        return
+    raise ValidationError(message)
@@ -1,27 +1,113 @@
-import json
 import logging
 import sys
-from typing import Optional
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from .serialization import dumps
+
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+LOG_BUFFER_BYTES = 64 * 1024
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__()
+        # (whole second, formatted timestamp); records within the same second reuse the string
+        self._time_cache: Tuple[int, str] = (-1, "")
+
+    def _format_time(self, created: float) -> str:
+        second = int(created)
+        cached_second, text = self._time_cache
+        if second != cached_second:
+            text = time.strftime(TIME_FORMAT, self.converter(created))
+            self._time_cache = (second, text)
+        return text
+
     def format(self, record: logging.LogRecord) -> str:
         payload = {
             "level": record.levelname,
             "name": record.name,
             "message": record.getMessage(),
-            "time": self.formatTime(record, datefmt="%Y-%m-%dT%H:%M:%S%z"),
+            "time": self._format_time(record.created),
         }
         if record.exc_info:
             payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=False)
+        return dumps(payload)
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that batches records into a single write.
+
+    Pending output is flushed on any WARNING or above, once ``capacity`` characters are
+    queued, or ``flush_interval`` seconds after the first queued record. logging's own
+    exit hook flushes whatever is left at shutdown.
+    """
+
+    def __init__(
+        self,
+        stream=None,
+        capacity: int = LOG_BUFFER_BYTES,
+        flush_interval: float = LOG_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        super().__init__(stream)
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._timer: Optional[threading.Timer] = None
+        # Most recent queued record, reported by handleError if a deferred write fails
+        self._last_record: Optional[logging.LogRecord] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Handler.handle already holds self.lock here
+        try:
+            msg = self.format(record) + self.terminator
+            self._pending.append(msg)
+            self._pending_size += len(msg)
+            self._last_record = record
+            if record.levelno >= logging.WARNING or self._pending_size >= self.capacity:
+                self._write_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        except Exception:
+            self.handleError(record)
+
+    def _write_pending(self) -> None:
+        """Write queued output; the queue is dropped even if the write fails, as StreamHandler drops a record."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending = self._pending
+        self._pending = []
+        self._pending_size = 0
+        if pending:
+            self.stream.write("".join(pending))
+        super().flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write_pending()
+        except Exception:
+            # The timer thread and logging.shutdown call this; a dead stdout must never raise from logging.
+            # A stream already closed at exit is ignored, as logging.shutdown does for StreamHandler.
+            if not getattr(self.stream, "closed", False):
+                self.handleError(self._last_record)
+        finally:
+            self.release()
 
 
 def configure_logging(level: int = logging.INFO) -> None:
     root = logging.getLogger()
     if root.handlers:
         return
-    handler = logging.StreamHandler(sys.stdout)
+    handler = BufferedStreamHandler(sys.stdout)
     handler.setFormatter(JsonFormatter())
     root.addHandler(handler)
     root.setLevel(level)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+
+class AsyncRateLimiter:
+    """Token bucket allowing ``max_rate`` acquisitions per ``time_period`` seconds."""
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.max_rate, self._tokens + elapsed * self.max_rate / self.time_period)
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+
+    def update(self, max_rate: float, time_period: float, remaining: Optional[float] = None) -> None:
+        """Retune the bucket to limits reported by the upstream API."""
+        if max_rate <= 0 or time_period <= 0:
+            return
+        self._refill()
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = min(self._tokens, max_rate)
+        if remaining is not None:
+            self._tokens = min(self._tokens, max(remaining, 0.0))
@@ -0,0 +1,41 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+else:
+    JSONDecodeError = json.JSONDecodeError  # type: ignore[misc]
+
+    def dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+__all__ = ["JSONDecodeError", "dumps", "dumps_bytes", "loads"]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Mapping whose entries expire ``ttl`` seconds after they are stored.
+
+    Once ``maxsize`` entries are held, storing a new key evicts the oldest one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry on the monotonic clock, value)
+        self._entries: Dict[K, Tuple[float, V]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        # Re-inserting moves the key to the end, so a refreshed entry is evicted last
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the least recently stored
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
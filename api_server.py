@@ -1,189 +1,227 @@
 #!/usr/bin/env python3
 """
-Simple Flask API server to bridge the frontend with the AI CRM automation backend.
+Simple async API server (FastAPI + Uvicorn) to bridge the frontend with the AI CRM automation backend.
 """
 
 import asyncio
-import json
 import logging
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+import os
 
-from ai_crm_automation.main import async_main
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for frontend requests
+from ai_crm_automation.main import cached_run_query, init_agents, load_config, run_query, warm_up_agents
+from ai_crm_automation.utils.api_client import create_http_client
+from ai_crm_automation.utils.serialization import JSONDecodeError, dumps_bytes, loads
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with orjson when it is installed (stdlib json otherwise)."""
+
+    def render(self, content) -> bytes:
+        return dumps_bytes(content)
+
+
+app = FastAPI(title="AI CRM API", default_response_class=FastJSONResponse)
+# Enable CORS for frontend requests
+app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PORT = int(os.getenv("PORT", "8000"))
+# The app is async and I/O-bound, so one process is the default. Each worker has its own
+# HubSpot rate limiter, so API_WORKERS=N lets the app send up to N times the HubSpot quota.
+WORKERS = int(os.getenv("API_WORKERS") or 1)
+# Orchestrator runs allowed in flight per worker; extra requests wait for a free slot
+MAX_CONCURRENT_RUNS = int(os.getenv("API_MAX_CONCURRENT_RUNS", "64"))
+# Auto-reload is for local development only: it runs a single process and watches every source file
+RELOAD = os.getenv("API_RELOAD", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Build the HubSpot and email agents once so every request shares their pooled HTTP client,
+    rate limiter, caches and SMTP session; requests only create their own orchestrator.
+    """
+    app.state.http_client = create_http_client()
+    app.state.run_slots = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+    app.state.agents = None
+    try:
+        hubspot_agent, email_agent, _ = init_agents(load_config(), http_client=app.state.http_client)
+    except Exception as e:
+        # Requests will retry agent setup themselves and report the error
+        logger.warning(f"Could not initialize shared agents: {str(e)}")
+        return
+    app.state.agents = (hubspot_agent, email_agent)
+    await warm_up_agents(hubspot_agent, email_agent)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if app.state.agents:
+        await asyncio.gather(*(agent.aclose() for agent in app.state.agents), return_exceptions=True)
+    await app.state.http_client.aclose()
+
+
+async def read_json(request: Request):
+    """Decode the raw request body with orjson (stdlib json without it); an empty body is None."""
+    raw = await request.body()
+    return loads(raw) if raw else None
 
-@app.route('/health', methods=['GET'])
-def health_check():
+
+# Serialized once; the Response itself is built per probe because middleware (CORS) edits its headers
+HEALTH_BODY = dumps_bytes({"status": "healthy", "service": "AI CRM API"})
+
+
+# Every route below is also registered with a trailing slash, which Starlette would
+# otherwise answer with a 307 redirect to the bare path
+@app.get('/health')
+@app.get('/health/', include_in_schema=False)
+async def health_check():
     """Health check endpoint."""
-    return jsonify({"status": "healthy", "service": "AI CRM API"})
+    return Response(HEALTH_BODY, media_type="application/json")
 
 
-@app.route('/chat', methods=['POST'])
-def chat():
+@app.post('/chat')
+@app.post('/chat/', include_in_schema=False)
+async def chat(request: Request):
     """
     Main chat endpoint that processes natural language queries
     and returns AI CRM responses.
     """
     try:
-        data = request.get_json()
+        data = await read_json(request)
+    except (JSONDecodeError, UnicodeDecodeError):
+        return FastJSONResponse({"error": "Invalid JSON body"}, status_code=400)
+
+    try:
         if not data or 'query' not in data:
-            return jsonify({"error": "Missing 'query' in request body"}), 400
-        
+            return FastJSONResponse({"error": "Missing 'query' in request body"}, status_code=400)
+
         user_query = data['query'].strip()
         if not user_query:
-            return jsonify({"error": "Query cannot be empty"}), 400
-        
+            return FastJSONResponse({"error": "Query cannot be empty"}, status_code=400)
+
         logger.info(f"Processing query: {user_query}")
-        
-        # Run the async main function with the user query
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            # Capture the output instead of printing it
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            output_buffer = io.StringIO()
-            
-            # Redirect stdout to capture the orchestrator output
-            with redirect_stdout(output_buffer):
-                result = loop.run_until_complete(async_main(user_query))
-            
-            # Get the captured output
-            response_text = output_buffer.getvalue().strip()
-            
-            if not response_text:
-                response_text = "Request processed successfully"
-            
-            logger.info(f"Response: {response_text}")
-            
-            return jsonify({
-                "response": response_text,
-                "status": "success"
-            })
-            
-        finally:
-            loop.close()
-    
+
+        async with request.app.state.run_slots:
+            response_text = (await cached_run_query(user_query, agents=request.app.state.agents)).strip()
+
+        if not response_text:
+            response_text = "Request processed successfully"
+
+        logger.info(f"Response: {response_text}")
+
+        return {
+            "response": response_text,
+            "status": "success"
+        }
+
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}", exc_info=True)
-        return jsonify({
+        return FastJSONResponse({
             "error": f"Internal server error: {str(e)}",
             "status": "error"
-        }), 500
+        }, status_code=500)
 
 
-@app.route('/api/contacts', methods=['POST'])
-def create_contact():
+@app.post('/api/contacts')
+@app.post('/api/contacts/', include_in_schema=False)
+async def create_contact(request: Request):
     """Direct API endpoint for creating contacts."""
     try:
-        data = request.get_json()
+        data = await read_json(request)
+    except (JSONDecodeError, UnicodeDecodeError):
+        return FastJSONResponse({"error": "Invalid JSON body"}, status_code=400)
+
+    try:
         required_fields = ['email']
-        
+
         if not data or not all(field in data for field in required_fields):
-            return jsonify({"error": "Missing required fields"}), 400
-        
+            return FastJSONResponse({"error": "Missing required fields"}, status_code=400)
+
         # Convert to natural language query
-        query = f"Create a contact for {data['email']}"
+        parts = [f"Create a contact for {data['email']}"]
         if data.get('firstName'):
-            query += f" named {data['firstName']}"
+            parts.append(f"named {data['firstName']}")
         if data.get('lastName'):
-            query += f" {data['lastName']}"
+            parts.append(str(data['lastName']))
         if data.get('phone'):
-            query += f" with phone {data['phone']}"
-        
+            parts.append(f"with phone {data['phone']}")
+        query = " ".join(parts)
+
         # Process through the main system
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            output_buffer = io.StringIO()
-            with redirect_stdout(output_buffer):
-                result = loop.run_until_complete(async_main(query))
-            
-            response_text = output_buffer.getvalue().strip()
-            
-            return jsonify({
-                "message": response_text or "Contact created successfully",
-                "status": "success"
-            })
-            
-        finally:
-            loop.close()
-    
+        async with request.app.state.run_slots:
+            response_text = (await run_query(query, agents=request.app.state.agents)).strip()
+
+        return {
+            "message": response_text or "Contact created successfully",
+            "status": "success"
+        }
+
     except Exception as e:
         logger.error(f"Error creating contact: {str(e)}", exc_info=True)
-        return jsonify({
+        return FastJSONResponse({
             "error": f"Failed to create contact: {str(e)}",
             "status": "error"
-        }), 500
+        }, status_code=500)
 
 
-@app.route('/api/deals', methods=['POST'])
-def create_deal():
+@app.post('/api/deals')
+@app.post('/api/deals/', include_in_schema=False)
+async def create_deal(request: Request):
     """Direct API endpoint for creating deals."""
     try:
-        data = request.get_json()
-        
+        data = await read_json(request)
+    except (JSONDecodeError, UnicodeDecodeError):
+        return FastJSONResponse({"error": "Invalid JSON body"}, status_code=400)
+
+    try:
         # Convert to natural language query
-        query = "Create a deal"
+        parts = ["Create a deal"]
         if data.get('dealName'):
-            query += f" named '{data['dealName']}'"
+            parts.append(f"named '{data['dealName']}'")
         if data.get('amount'):
-            query += f" worth ${data['amount']}"
+            parts.append(f"worth ${data['amount']}")
         if data.get('stage'):
-            query += f" in {data['stage']} stage"
+            parts.append(f"in {data['stage']} stage")
         if data.get('associated_contact_email'):
-            query += f" for contact {data['associated_contact_email']}"
-        
+            parts.append(f"for contact {data['associated_contact_email']}")
+        query = " ".join(parts)
+
         # Process through the main system
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        try:
-            import io
-            import sys
-            from contextlib import redirect_stdout
-            
-            output_buffer = io.StringIO()
-            with redirect_stdout(output_buffer):
-                result = loop.run_until_complete(async_main(query))
-            
-            response_text = output_buffer.getvalue().strip()
-            
-            return jsonify({
-                "message": response_text or "Deal created successfully",
-                "status": "success"
-            })
-            
-        finally:
-            loop.close()
-    
+        async with request.app.state.run_slots:
+            response_text = (await run_query(query, agents=request.app.state.agents)).strip()
+
+        return {
+            "message": response_text or "Deal created successfully",
+            "status": "success"
+        }
+
     except Exception as e:
         logger.error(f"Error creating deal: {str(e)}", exc_info=True)
-        return jsonify({
+        return FastJSONResponse({
             "error": f"Failed to create deal: {str(e)}",
             "status": "error"
-        }), 500
+        }, status_code=500)
 
 
 if __name__ == '__main__':
     print("🚀 Starting AI CRM API Server...")
     print("📱 Frontend should be served from the 'frontend' directory")
-    print("🌐 API will be available at http://localhost:8000")
+    print(f"🌐 API will be available at http://localhost:{PORT}")
     print("💡 Make sure your .env file is configured with API keys")
-    
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+
+    # Workers need an import string so each process can load its own app
+    uvicorn.run(
+        "api_server:app",
+        host='0.0.0.0',
+        port=PORT,
+        workers=1 if RELOAD else WORKERS,
+        reload=RELOAD,
+    )
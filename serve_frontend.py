@@ -3,19 +3,122 @@
 Simple HTTP server to serve the frontend files.
 """
 
+import gzip
+import hashlib
 import http.server
-import socketserver
+import mimetypes
 import os
 import webbrowser
 from pathlib import Path
+from typing import Dict, NamedTuple, Optional, Set
+from urllib.parse import unquote, urlsplit
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip alone still applies
+    brotli = None
 
 PORT = 3000
 FRONTEND_DIR = Path(__file__).parent / "frontend"
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class CachedFile(NamedTuple):
+    body: bytes
+    etag: str
+    content_type: str
+    # Content-Encoding -> precompressed body, in order of preference
+    encoded: Dict[str, bytes]
+
+
+# URL path -> file contents, filled once at startup (restart to pick up edits)
+CACHE: Dict[str, CachedFile] = {}
+
+
+def load_static_files(root: Path) -> Dict[str, CachedFile]:
+    """Read every file under ``root`` into memory, keyed by its URL path."""
+    files = {}
+    for path in sorted(root.rglob("*")):
+        if not path.is_file():
+            continue
+        body = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        url = "/" + path.relative_to(root).as_posix()
+        files[url] = CachedFile(body, f'"{hashlib.sha1(body).hexdigest()}"', content_type, _compress(body, content_type))
+        if path.name == "index.html":
+            files[url[:-len("index.html")]] = files[url]
+    return files
+
+
+def _compress(body: bytes, content_type: str) -> Dict[str, bytes]:
+    """Precompress text assets, keeping only variants that are actually smaller."""
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return {}
+    variants = {}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body)
+    variants["gzip"] = gzip.compress(body, 6)
+    return {encoding: data for encoding, data in variants.items() if len(data) < len(body)}
+
+
+def _accepted_encodings(header: str) -> Set[str]:
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.partition(";")
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
 
 class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(FRONTEND_DIR), **kwargs)
-    
+
+    def do_GET(self):
+        body = self._send_cached_headers()
+        if body is None:
+            super().do_GET()
+        else:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        if self._send_cached_headers() is None:
+            super().do_HEAD()
+
+    def _send_cached_headers(self) -> Optional[bytes]:
+        """Send headers for a preloaded file and return its body, or None when the path is not cached."""
+        cached = CACHE.get(unquote(urlsplit(self.path).path))
+        if cached is None:
+            return None
+        body, etag, encoding = cached.body, cached.etag, None
+        accepted = _accepted_encodings(self.headers.get("Accept-Encoding", ""))
+        for name, data in cached.encoded.items():
+            if name in accepted:
+                # Each representation gets its own ETag so caches never mix them up
+                body, etag, encoding = data, f'{cached.etag[:-1]}-{name}"', name
+                break
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return b""
+        self.send_response(200)
+        self.send_header("Content-Type", cached.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        if cached.encoded:
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        return body
+
     def end_headers(self):
         # Add CORS headers
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -28,6 +131,8 @@ def main():
         print(f"❌ Frontend directory not found: {FRONTEND_DIR}")
         return
     
+    CACHE.update(load_static_files(FRONTEND_DIR))
+
     print(f"🌐 Starting frontend server...")
     print(f"📁 Serving files from: {FRONTEND_DIR}")
     print(f"🔗 Frontend URL: http://localhost:{PORT}")
@@ -35,7 +140,8 @@ def main():
     print(f"⏹️  Press Ctrl+C to stop the server")
     
     try:
-        with socketserver.TCPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
+        # One thread per connection so assets on a page load download in parallel
+        with http.server.ThreadingHTTPServer(("", PORT), CustomHTTPRequestHandler) as httpd:
             # Open browser automatically
             webbrowser.open(f'http://localhost:{PORT}')
             httpd.serve_forever()
@@ -3,28 +3,30 @@
 Startup script to run both the API server and frontend server.
 """
 
+import os
 import subprocess
 import sys
 import time
+import urllib.error
+import urllib.request
 import webbrowser
+from importlib.util import find_spec
 from pathlib import Path
 
 def check_requirements():
     """Check if required dependencies are installed."""
+    # find_spec only locates the packages, so the probe doesn't pay their import cost
+    if find_spec("fastapi") is not None and find_spec("uvicorn") is not None:
+        print("✅ API server dependencies found")
+        return True
+    print("❌ Missing API server dependencies. Installing...")
     try:
-        import flask
-        import flask_cors
-        print("✅ Flask dependencies found")
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements-api.txt"])
+        print("✅ Dependencies installed successfully")
         return True
-    except ImportError:
-        print("❌ Missing Flask dependencies. Installing...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements-api.txt"])
-            print("✅ Dependencies installed successfully")
-            return True
-        except subprocess.CalledProcessError:
-            print("❌ Failed to install dependencies")
-            return False
+    except subprocess.CalledProcessError:
+        print("❌ Failed to install dependencies")
+        return False
 
 def check_config():
     """Check if configuration files exist."""
@@ -42,33 +44,60 @@ def check_config():
         print("   Create ai_crm_automation/config.json or .env file with your credentials.")
         return False
 
+def wait_until_ready(url, process, timeout=30.0):
+    """Poll ``url`` with exponential backoff until it answers, the process exits, or ``timeout`` passes."""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return True
+        except urllib.error.HTTPError:
+            # Any HTTP response means the server is accepting requests
+            return True
+        except OSError:
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
+    return False
+
 def start_servers():
     """Start both API and frontend servers."""
     print("🚀 Starting AI CRM servers...")
     
+    # Child output goes to append-mode log files; an undrained PIPE would block the
+    # servers once the OS pipe buffer filled up
+    api_log = open("api.log", "ab", buffering=0)
+    frontend_log = open("frontend.log", "ab", buffering=0)
+    
     # Start API server
     print("📡 Starting API server on port 8000...")
+    # One worker by default: every worker runs its own HubSpot rate limiter
+    workers = os.getenv("API_WORKERS") or "1"
     api_process = subprocess.Popen([
-        sys.executable, "api_server.py"
-    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        sys.executable, "-m", "uvicorn", "api_server:app",
+        "--host", "0.0.0.0", "--port", "8000", "--workers", workers
+    ], stdout=api_log, stderr=subprocess.STDOUT)
     
-    # Wait a moment for API server to start
-    time.sleep(2)
+    if not wait_until_ready("http://localhost:8000/health", api_process):
+        print("⚠️  API server did not report healthy; check api.log")
     
     # Start frontend server
     print("🌐 Starting frontend server on port 3000...")
     frontend_process = subprocess.Popen([
         sys.executable, "serve_frontend.py"
-    ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    ], stdout=frontend_log, stderr=subprocess.STDOUT)
     
-    # Wait a moment for frontend server to start
-    time.sleep(2)
+    if not wait_until_ready("http://localhost:3000/", frontend_process):
+        print("⚠️  Frontend server did not start; check frontend.log")
     
     print("\n" + "="*50)
     print("🎉 AI CRM is now running!")
     print("🌐 Frontend: http://localhost:3000")
     print("📡 API: http://localhost:8000")
     print("📚 Health check: http://localhost:8000/health")
+    print("📝 Logs: api.log, frontend.log")
     print("⏹️  Press Ctrl+C to stop both servers")
     print("="*50 + "\n")
     
@@ -89,6 +118,9 @@ def start_servers():
         frontend_process.wait()
         
         print("👋 Servers stopped successfully")
+    finally:
+        api_log.close()
+        frontend_log.close()
 
 def main():
     print("🤖 AI CRM Startup Script")
@@ -0,0 +1,15 @@
+import httpx
+import pytest
+
+from ai_crm_automation.utils.api_client import AsyncApiClient
+
+
+@pytest.fixture
+def mock_api_client():
+    """Factory for an AsyncApiClient whose requests are answered by ``handler``."""
+
+    def make(handler, **kwargs) -> AsyncApiClient:
+        transport = httpx.MockTransport(handler)
+        return AsyncApiClient("https://api.test", client=httpx.AsyncClient(transport=transport), **kwargs)
+
+    return make
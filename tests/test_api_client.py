@@ -0,0 +1,102 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from ai_crm_automation.utils import api_client
+from ai_crm_automation.utils.api_client import _retry_after_delay
+from ai_crm_automation.utils.error_handler import ApiError
+
+
+def rate_limited(request: httpx.Request, retry_after: str = "0") -> httpx.Response:
+    return httpx.Response(429, json={"message": "slow down"}, headers={"Retry-After": retry_after})
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(api_client, "_backoff_delay", lambda attempt: 0.0)
+
+
+def test_retries_429_then_succeeds(mock_api_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return rate_limited(request)
+        return httpx.Response(200, json={"id": "1"})
+
+    body = asyncio.run(mock_api_client(handler, max_retries=3).post("/objects", json={"a": 1}))
+
+    assert body == {"id": "1"}
+    assert len(calls) == 3
+    assert all(call.content == b'{"a":1}' for call in calls)
+
+
+def test_raises_api_error_when_retries_exhausted(mock_api_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return rate_limited(request)
+
+    with pytest.raises(ApiError) as exc_info:
+        asyncio.run(mock_api_client(handler, max_retries=2).get("/objects"))
+
+    assert exc_info.value.status == 429
+    assert exc_info.value.details == {"message": "slow down"}
+    assert len(calls) == 3
+
+
+def test_retries_transport_errors(mock_api_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, text="ok", headers={"Content-Type": "text/plain"})
+
+    assert asyncio.run(mock_api_client(handler).get("/ping")) == "ok"
+    assert len(calls) == 2
+
+
+def test_other_errors_are_not_retried(mock_api_client):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400, json={"errors": ["bad"]})
+
+    with pytest.raises(ApiError) as exc_info:
+        asyncio.run(mock_api_client(handler).get("/objects"))
+
+    assert exc_info.value.status == 400
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("headers", "expected"),
+    [
+        ({"Retry-After": "3"}, 3.0),
+        ({"Retry-After": "600"}, api_client.RETRY_AFTER_MAX_SECONDS),
+        ({"X-HubSpot-RateLimit-Interval-Milliseconds": "1500"}, 1.5),
+    ],
+)
+def test_retry_after_delay(headers, expected):
+    response = httpx.Response(429, headers=headers)
+    assert _retry_after_delay(response, attempt=1) == expected
+
+
+def test_retry_after_http_date():
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    response = httpx.Response(429, headers={"Retry-After": format_datetime(reset_at, usegmt=True)})
+    assert 0 < _retry_after_delay(response, attempt=1) <= 10
+
+
+def test_retry_after_falls_back_to_backoff(monkeypatch):
+    monkeypatch.setattr(api_client, "_backoff_delay", lambda attempt: attempt * 0.25)
+    response = httpx.Response(429, headers={"Retry-After": "not a date"})
+    assert _retry_after_delay(response, attempt=2) == 0.5
@@ -0,0 +1,97 @@
+import asyncio
+
+import httpcore
+import pytest
+
+from ai_crm_automation.utils import dns_cache
+from ai_crm_automation.utils.api_client import create_http_client
+from ai_crm_automation.utils.dns_cache import CachingNetworkBackend, DNSCache
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    """Records connect attempts; addresses in ``refused`` fail to connect."""
+
+    def __init__(self, refused=()):
+        self.refused = set(refused)
+        self.attempts = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.attempts.append(host)
+        if host in self.refused:
+            raise httpcore.ConnectError(f"{host} refused")
+        return host
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise NotImplementedError
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Answer every DNS lookup with two addresses and count the lookups."""
+    calls = []
+
+    async def resolve(self, host, port):
+        calls.append((host, port))
+        return self._entries.setdefault((host, port), (float("inf"), ["10.0.0.1", "10.0.0.2"]))[1]
+
+    monkeypatch.setattr(DNSCache, "resolve", resolve)
+    return calls
+
+
+def test_create_http_client_wraps_the_pool_backend():
+    client = create_http_client()
+    try:
+        assert isinstance(client._transport._pool._network_backend, CachingNetworkBackend)
+    finally:
+        asyncio.run(client.aclose())
+
+
+def test_resolve_caches_until_ttl(monkeypatch):
+    calls = []
+
+    class Loop:
+        async def getaddrinfo(self, host, port, type):
+            calls.append(host)
+            return [(None, None, None, "", ("10.0.0.1", port)), (None, None, None, "", ("10.0.0.1", port))]
+
+    monkeypatch.setattr(dns_cache.asyncio, "get_running_loop", lambda: Loop())
+    cache = DNSCache(ttl=0.0)
+
+    assert asyncio.run(cache.resolve("api.test", 443)) == ["10.0.0.1"]
+    asyncio.run(cache.resolve("api.test", 443))
+    assert calls == ["api.test", "api.test"]
+
+    cache.ttl = 60.0
+    asyncio.run(cache.resolve("api.test", 443))
+    asyncio.run(cache.resolve("api.test", 443))
+    assert len(calls) == 3
+
+
+def test_falls_back_to_the_next_address(lookups):
+    backend = FakeBackend(refused={"10.0.0.1"})
+    wrapped = CachingNetworkBackend(backend, DNSCache())
+
+    assert asyncio.run(wrapped.connect_tcp("api.test", 443)) == "10.0.0.2"
+    assert backend.attempts == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_invalidates_after_every_address_fails(lookups):
+    cache = DNSCache()
+    wrapped = CachingNetworkBackend(FakeBackend(refused={"10.0.0.1", "10.0.0.2"}), cache)
+
+    with pytest.raises(httpcore.ConnectError):
+        asyncio.run(wrapped.connect_tcp("api.test", 443))
+
+    assert ("api.test", 443) not in cache._entries
+
+
+def test_ip_literals_bypass_the_cache(lookups):
+    backend = FakeBackend()
+    wrapped = CachingNetworkBackend(backend, DNSCache())
+
+    assert asyncio.run(wrapped.connect_tcp("192.0.2.7", 443)) == "192.0.2.7"
+    assert asyncio.run(wrapped.connect_tcp("::1", 443)) == "::1"
+    assert lookups == []
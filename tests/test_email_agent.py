@@ -0,0 +1,144 @@
+import asyncio
+
+import aiosmtplib
+import pytest
+
+from ai_crm_automation.agents import email_agent
+from ai_crm_automation.agents.email_agent import EmailAgent, EmailPayload
+
+
+class FakeSMTP:
+    """Stands in for aiosmtplib.SMTP; ``fail_sends`` sends raise SMTPServerDisconnected."""
+
+    instances = []
+    fail_sends = 0
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.is_connected = False
+        self.sent = []
+        self.quit_called = False
+        FakeSMTP.instances.append(self)
+
+    async def connect(self):
+        self.is_connected = True
+
+    async def send_message(self, message):
+        if FakeSMTP.fail_sends:
+            FakeSMTP.fail_sends -= 1
+            self.is_connected = False
+            raise aiosmtplib.SMTPServerDisconnected("Server disconnected")
+        self.sent.append(message["To"])
+
+    async def quit(self):
+        self.quit_called = True
+        self.is_connected = False
+
+    def close(self):
+        self.is_connected = False
+
+
+@pytest.fixture(autouse=True)
+def fake_smtp(monkeypatch):
+    FakeSMTP.instances = []
+    FakeSMTP.fail_sends = 0
+    monkeypatch.setattr(email_agent.aiosmtplib, "SMTP", FakeSMTP)
+
+
+def make_agent() -> EmailAgent:
+    return EmailAgent({"provider": "smtp", "from_email": "crm@example.com", "smtp": {"host": "smtp.test"}})
+
+
+def payload(to: str = "a@example.com") -> EmailPayload:
+    return EmailPayload(to=to, subject="Hi", html="<p>Hi</p>")
+
+
+def test_connection_is_reused_across_sends():
+    async def run():
+        agent = make_agent()
+        await agent.send(payload("a@example.com"))
+        await agent.send(payload("b@example.com"))
+        await agent.aclose()
+
+    asyncio.run(run())
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].sent == ["a@example.com", "b@example.com"]
+
+
+def test_dropped_session_is_resent_once():
+    FakeSMTP.fail_sends = 1
+
+    async def run():
+        agent = make_agent()
+        await agent.send(payload())
+        await agent.aclose()
+
+    asyncio.run(run())
+
+    first, second = FakeSMTP.instances
+    assert first.sent == []
+    assert second.sent == ["a@example.com"]
+
+
+def test_second_drop_is_raised():
+    FakeSMTP.fail_sends = 2
+
+    async def run():
+        agent = make_agent()
+        try:
+            await agent.send(payload())
+        finally:
+            await agent.aclose()
+
+    with pytest.raises(aiosmtplib.SMTPServerDisconnected):
+        asyncio.run(run())
+    assert len(FakeSMTP.instances) == 2
+
+
+def test_connection_is_recycled_at_message_limit(monkeypatch):
+    monkeypatch.setattr(email_agent, "SMTP_MAX_MESSAGES_PER_CONNECTION", 2)
+
+    async def run():
+        agent = make_agent()
+        for i in range(3):
+            await agent.send(payload(f"user{i}@example.com"))
+        await agent.aclose()
+
+    asyncio.run(run())
+
+    first, second = FakeSMTP.instances
+    assert first.sent == ["user0@example.com", "user1@example.com"]
+    assert first.quit_called
+    assert second.sent == ["user2@example.com"]
+
+
+def test_aclose_cancels_reaper_and_quits():
+    async def run():
+        agent = make_agent()
+        await agent.send(payload())
+        reaper = agent._smtp_reaper
+        await agent.aclose()
+        await asyncio.sleep(0)
+        return agent, reaper
+
+    agent, reaper = asyncio.run(run())
+
+    assert reaper.cancelled()
+    assert agent._smtp_reaper is None
+    assert FakeSMTP.instances[0].quit_called
+
+
+def test_idle_connection_is_reaped(monkeypatch):
+    monkeypatch.setattr(email_agent, "SMTP_IDLE_TIMEOUT_SECONDS", 0.01)
+
+    async def run():
+        agent = make_agent()
+        await agent.send(payload())
+        await asyncio.wait_for(agent._smtp_reaper, timeout=1)
+        return agent
+
+    agent = asyncio.run(run())
+
+    assert agent._smtp_conn is None
+    assert FakeSMTP.instances[0].quit_called
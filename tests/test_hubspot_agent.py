@@ -0,0 +1,52 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_crm_automation.agents.hubspot_agent import HubSpotAgent
+from ai_crm_automation.utils.error_handler import ApiError
+
+
+def make_agent(handler) -> HubSpotAgent:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return HubSpotAgent("token", "https://api.hubapi.test", http_client=client)
+
+
+def test_stale_contact_id_is_dropped_on_404():
+    calls = []
+
+    def handler(request):
+        calls.append((request.method, request.url.path))
+        if request.method == "PATCH":
+            return httpx.Response(404, json={"message": "resource not found"})
+        return httpx.Response(200, json={"results": [{"id": "2", "properties": {"email": "a@example.com"}}]})
+
+    agent = make_agent(handler)
+    agent._remember_contact_id("A@example.com", "1")
+
+    with pytest.raises(ApiError):
+        asyncio.run(agent.update_contact("a@example.com", phone="555"))
+    assert agent._contact_id_cache.get("a@example.com") is None
+
+    # The next lookup searches again instead of reusing the stale id
+    with pytest.raises(ApiError):
+        asyncio.run(agent.update_contact("a@example.com", phone="555"))
+    assert calls == [
+        ("PATCH", "/crm/v3/objects/contacts/1"),
+        ("POST", "/crm/v3/objects/contacts/search"),
+        ("PATCH", "/crm/v3/objects/contacts/2"),
+    ]
+
+
+def test_stale_contact_id_is_dropped_when_association_404s():
+    def handler(request):
+        if request.method == "PUT":
+            return httpx.Response(404, json={"message": "resource not found"})
+        return httpx.Response(201, json={"id": "99"})
+
+    agent = make_agent(handler)
+    agent._remember_contact_id("a@example.com", "1")
+
+    with pytest.raises(ApiError):
+        asyncio.run(agent.create_deal(name="Deal", associated_contact_email="a@example.com"))
+    assert agent._contact_id_cache.get("a@example.com") is None
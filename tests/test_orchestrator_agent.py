@@ -0,0 +1,26 @@
+from ai_crm_automation.agents import orchestrator_agent
+from ai_crm_automation.agents.orchestrator_agent import OrchestratorAgent, OrchestratorConfig
+
+
+def make_orchestrator() -> OrchestratorAgent:
+    config = OrchestratorConfig(openai_api_key="sk-test", openai_model="gpt-4o-mini")
+    return OrchestratorAgent(config, hubspot=None, email=None)  # type: ignore[arg-type]
+
+
+def test_each_orchestrator_builds_its_own_llm():
+    first, second = make_orchestrator(), make_orchestrator()
+
+    first._build_agent()
+    second._build_agent()
+
+    assert first.llm is not None and second.llm is not None
+    assert first.llm is not second.llm
+    # The OpenAI client's connection pool belongs to the event loop it first ran on
+    assert first.llm.async_client is not second.llm.async_client
+
+
+def test_tool_schemas_are_converted_once():
+    schemas = orchestrator_agent._tool_schemas()
+
+    assert orchestrator_agent._tool_schemas() is schemas
+    assert [schema["function"]["name"] for schema in schemas] == [name for name, *_ in orchestrator_agent.TOOL_SPECS]
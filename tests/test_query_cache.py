@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from ai_crm_automation import main
+
+
+class FakeOrchestrator:
+    def __init__(self, runs, ok, tool_calls):
+        self.runs = runs
+        self.ok = ok
+        self.tool_calls = tool_calls
+        self.last_run_ok = False
+        self.last_run_tool_calls = 0
+
+    async def run(self, query):
+        self.runs.append(query)
+        self.last_run_ok = self.ok
+        self.last_run_tool_calls = self.tool_calls
+        return f"reply {len(self.runs)}"
+
+
+@pytest.fixture
+def orchestrator_runs(monkeypatch):
+    """Patch in a fake orchestrator; returns (runs, configure(ok, tool_calls))."""
+    runs = []
+    outcome = {"ok": True, "tool_calls": 0}
+    monkeypatch.setattr(main, "load_config", lambda: {})
+    monkeypatch.setattr(
+        main,
+        "init_orchestrator",
+        lambda config, hubspot, email: FakeOrchestrator(runs, outcome["ok"], outcome["tool_calls"]),
+    )
+    main._query_cache.clear()
+    yield runs, outcome
+    main._query_cache.clear()
+
+
+def ask(query):
+    return asyncio.run(main.cached_run_query(query, agents=(object(), object())))
+
+
+def test_reply_without_tool_calls_is_reused(orchestrator_runs):
+    runs, _ = orchestrator_runs
+
+    assert ask("List my deals") == "reply 1"
+    assert ask("  list MY deals ") == "reply 1"
+    assert len(runs) == 1
+
+
+@pytest.mark.parametrize(
+    ("ok", "tool_calls"),
+    [(True, 1), (True, 3), (False, 0), (False, 2)],
+)
+def test_runs_with_tool_calls_or_errors_are_never_cached(orchestrator_runs, ok, tool_calls):
+    runs, outcome = orchestrator_runs
+    outcome.update(ok=ok, tool_calls=tool_calls)
+
+    assert ask("Create a contact for bob@acme.com") == "reply 1"
+    assert ask("Create a contact for bob@acme.com") == "reply 2"
+    assert len(runs) == 2
+    assert len(main._query_cache) == 0
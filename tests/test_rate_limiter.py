@@ -0,0 +1,78 @@
+import asyncio
+import time
+
+import httpx
+
+from ai_crm_automation.utils.rate_limiter import AsyncRateLimiter
+
+
+def test_update_retunes_rate_and_caps_tokens():
+    limiter = AsyncRateLimiter(100, 10.0)
+
+    limiter.update(max_rate=20, time_period=2.0, remaining=3)
+
+    assert limiter.max_rate == 20
+    assert limiter.time_period == 2.0
+    assert limiter._tokens <= 3
+
+
+def test_update_ignores_invalid_limits():
+    limiter = AsyncRateLimiter(10, 1.0)
+
+    limiter.update(max_rate=0, time_period=1.0)
+    limiter.update(max_rate=5, time_period=-1.0)
+
+    assert limiter.max_rate == 10
+    assert limiter.time_period == 1.0
+
+
+def test_update_clamps_negative_remaining():
+    limiter = AsyncRateLimiter(10, 1.0)
+
+    limiter.update(max_rate=10, time_period=1.0, remaining=-4)
+
+    assert limiter._tokens == 0
+
+
+def test_acquire_waits_once_bucket_is_empty():
+    async def run():
+        limiter = AsyncRateLimiter(2, 0.2)
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    # Two tokens are available up front; the third refills at 10 per second
+    assert asyncio.run(run()) >= 0.08
+
+
+def test_acquire_respects_remaining_from_update():
+    async def run():
+        limiter = AsyncRateLimiter(10, 1.0)
+        limiter.update(max_rate=10, time_period=1.0, remaining=0)
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.08
+
+
+def test_rate_limit_headers_retune_limiter(mock_api_client):
+    limiter = AsyncRateLimiter(100, 10.0)
+
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={},
+            headers={
+                "X-HubSpot-RateLimit-Max": "50",
+                "X-HubSpot-RateLimit-Interval-Milliseconds": "2000",
+                "X-HubSpot-RateLimit-Remaining": "5",
+            },
+        )
+
+    asyncio.run(mock_api_client(handler, rate_limiter=limiter).get("/objects"))
+
+    assert limiter.max_rate == 50
+    assert limiter.time_period == 2.0
+    assert limiter._tokens <= 5
@@ -0,0 +1,51 @@
+import asyncio
+from contextlib import aclosing
+
+import httpx
+import pytest
+
+from ai_crm_automation.utils import api_client
+from ai_crm_automation.utils.api_client import AsyncApiClient
+from ai_crm_automation.utils.error_handler import ApiError
+
+
+def search_handler(request):
+    results = [{"id": str(i), "properties": {"email": f"user{i}@example.com"}} for i in range(3)]
+    return httpx.Response(200, json={"total": 3, "results": results})
+
+
+async def collect(client: AsyncApiClient, item_path: str = "results.item", limit=None):
+    items = []
+    async with aclosing(client.stream_items("POST", "/search", item_path=item_path, json={})) as stream:
+        async for item in stream:
+            items.append(item)
+            if limit is not None and len(items) >= limit:
+                break
+    return items
+
+
+@pytest.mark.parametrize("use_ijson", [True, False])
+def test_stream_items(monkeypatch, mock_api_client, use_ijson):
+    if use_ijson:
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(api_client, "ijson", None)
+    client = mock_api_client(search_handler)
+
+    items = asyncio.run(collect(client))
+    assert [item["id"] for item in items] == ["0", "1", "2"]
+
+    emails = asyncio.run(collect(client, item_path="results.item.properties.email"))
+    assert emails == ["user0@example.com", "user1@example.com", "user2@example.com"]
+
+    assert len(asyncio.run(collect(client, limit=1))) == 1
+
+
+def test_stream_items_raises_on_error_status(mock_api_client):
+    def handler(request):
+        return httpx.Response(404, json={"message": "missing"})
+
+    with pytest.raises(ApiError) as exc_info:
+        asyncio.run(collect(mock_api_client(handler)))
+
+    assert exc_info.value.status == 404
@@ -0,0 +1,38 @@
+from ai_crm_automation.utils import ttl_cache
+from ai_crm_automation.utils.ttl_cache import TTLCache
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(ttl_cache.time, "monotonic", lambda: now[0])
+    cache = TTLCache(maxsize=4, ttl=10.0)
+
+    cache.set("a", 1)
+    now[0] += 9.9
+    assert cache.get("a") == 1
+    now[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_oldest_entry_is_evicted_at_maxsize():
+    cache = TTLCache(maxsize=2, ttl=60.0)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 3)
+    cache.set("c", 4)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 3
+    assert cache.get("c") == 4
+
+
+def test_pop_ignores_missing_keys():
+    cache = TTLCache(maxsize=2, ttl=60.0)
+    cache.set("a", 1)
+
+    cache.pop("a")
+    cache.pop("a")
+
+    assert cache.get("a") is None